@@ -0,0 +1,550 @@
+# Memory Benchmarks - Andrew Li
+# This program measures how much the game loops of the three versions
+# of the game in the memory package cost.
+# It runs the game headless with the SDL dummy video driver so it
+# can be run on machines without a display. The dummy driver cannot
+# block for events, so pygame.event.wait polls it every millisecond;
+# set SDL_VIDEODRIVER to the real driver to measure the idle loop
+# the way players run it.
+# Benchmarks:
+# idle - frames drawn and CPU seconds used per minute while nobody
+#        clicks, for the event driven loop and for a loop that ticks at
+#        the frame rate, the CPU seconds are left out with the dummy driver
+# blit - tiles drawn per second from the loaded bitmaps as they are
+#        and from the display format atlas
+# loop - plays each version on the same seeded boards for a number of
+#        frames with the same scripted clicks, starting a new game once
+#        one is solved, and reports frames per second, the p50 and p99
+#        frame times, the peak memory and the number of objects, which
+#        are checked against a saved baseline
+# startup - time from making a game to its first frame with the faces
+#        loaded in the background, and time to load every face up front,
+#        with an empty and a full cache of faces on disk
+# resize - drags the size of the window out and back twice and prints
+#        the milliseconds per frame, the second drag uses the faces kept
+#        from the first
+# replay - plays recorded input logs (memory --record) as fast as
+#        it can and prints the outcome of each game and the games per second
+# coldstart - milliseconds for a new process to import the package, to
+#        show the help of the memory command and to show the first frame
+#        of a game, which are checked against the saved baseline
+# The baseline is benchmark_baseline.json next to this file. The one in
+# the repository was saved on a developer machine, the times of another
+# machine (or a CI runner) are only comparable to a baseline saved there:
+#
+# python benchmark.py loop coldstart --save-baseline   (once, on the machine)
+# python benchmark.py loop coldstart                   (exits 1 on a regression)
+#
+# A missing baseline is a failure, and the objects a game grows by are
+# checked against a fixed limit that does not depend on the machine.
+
+# import os and sys to set up the driver before pygame starts,
+# time for the cpu clock, argparse for the options and the rest to
+# run each version of the game in its own process and measure it
+import os
+import sys
+import time
+import argparse
+import gc
+import json
+import random
+import resource
+import importlib
+import subprocess
+import tempfile
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import pygame
+from memory import v3
+from memory.replay import ReplayClock, read_log
+
+# names of the benchmarks in the order they run
+BENCHMARKS = ['idle', 'blit', 'loop', 'startup', 'resize', 'replay', 'coldstart']
+
+# versions of the game the loop benchmark plays
+VERSIONS = ['v1', 'v2', 'v3']
+
+# where the loop and coldstart results are saved to compare later runs against
+BASELINE = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'benchmark_baseline.json')
+
+# a loop result is a regression when it is worse than the baseline by more than this,
+# growth is the most objects a game may gain over its frames with or without a baseline,
+# start up times are short, so they are also allowed a few milliseconds more
+TOLERANCE = {'fps': 0.8, 'p99': 1.5, 'rss': 1.2, 'growth': 1000, 'start': 1.5, 'start_ms': 10}
+
+# the code each coldstart run times in a new process
+COLDSTART = {'python': 'pass',
+             'import': 'import memory, memory.cli, memory.engine',
+             'help': 'import sys; from memory.cli import main; sys.argv[1:] = ["--help"]; main()',
+             'first frame': 'import pygame; from memory import v3; pygame.init(); '
+                            'pygame.display.set_mode((520, 415)); v3.Game(pygame.display.get_surface()).frame()'}
+
+
+# User-defined functions
+
+def main():
+    # parse the options and run each of the chosen benchmarks
+    parser = argparse.ArgumentParser(description='Benchmarks for the Memory game loop')
+    parser.add_argument('benchmarks', nargs='*', metavar='benchmark',
+                        help='benchmarks to run, one of %s (default: all)' % ', '.join(BENCHMARKS))
+    parser.add_argument('--seconds', type=float, default=10,
+                        help='how long each idle run lasts (default: 10)')
+    parser.add_argument('--blits', type=int, default=20000,
+                        help='how many tiles each blit run draws (default: 20000)')
+    parser.add_argument('--frames', type=int, default=10000,
+                        help='how many frames each version plays in the loop run (default: 10000)')
+    parser.add_argument('--versions', nargs='+', choices=VERSIONS, default=VERSIONS,
+                        help='versions the loop run plays (default: all)')
+    parser.add_argument('--baseline', default=BASELINE,
+                        help='file of the loop results to compare against (default: %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='save the loop and coldstart results as the new baseline')
+    parser.add_argument('--logs', nargs='+', default=[], metavar='LOG',
+                        help='input logs the replay run plays')
+    parser.add_argument('--child', choices=VERSIONS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # the loop run plays each version in a process of its own
+    if args.child:
+        print(json.dumps(loop_one(args.child, args.frames)))
+        return 0
+
+    benchmarks = args.benchmarks or BENCHMARKS
+    for name in benchmarks:
+        if name not in BENCHMARKS:
+            parser.error('unknown benchmark %r' % name)
+
+    if 'idle' in benchmarks:
+        idle(args.seconds)
+    if 'blit' in benchmarks:
+        blit(args.blits)
+    status = 0
+    if 'loop' in benchmarks:
+        status = loop(args.frames, args.versions, args.baseline, args.save_baseline)
+    if 'startup' in benchmarks:
+        startup()
+    if 'resize' in benchmarks:
+        resize()
+    if 'replay' in benchmarks:
+        replay(args.logs)
+    if 'coldstart' in benchmarks:
+        status = max(status, coldstart(args.baseline, args.save_baseline))
+    return status
+
+
+def start_game():
+    # starts pygame and returns a new game on a headless window
+
+    pygame.init()
+    pygame.display.set_mode((520, 415))
+    return v3.Game(pygame.display.get_surface())
+
+
+def idle(seconds):
+    # prints the frames drawn and the CPU seconds used per idle minute of
+    # the game loop, the CPU seconds only with a driver that can sleep
+    # - seconds is how long the game is left idle for each loop
+
+    # the event driven loop of Game.play, stopped by a QUIT event
+    game = start_game()
+    driver = pygame.display.get_driver()
+    pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), 1)
+    start = time.process_time()
+    game.play()
+    event_driven = (time.process_time() - start) / seconds * 60
+    event_frames = game.frame_counter / seconds * 60
+    pygame.quit()
+
+    # the same frames, but ticking at the frame rate like the old loop
+    game = start_game()
+    pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), 1)
+    start = time.process_time()
+    while not game.close_clicked:
+        game.frame()
+        game.game_Clock.tick(game.FPS)
+    fixed_rate = (time.process_time() - start) / seconds * 60
+    fixed_frames = game.frame_counter / seconds * 60
+    pygame.quit()
+
+    print('idle minute              frames   CPU seconds')
+    if driver == 'dummy':
+        # pygame.event.wait polls the dummy driver every millisecond, so
+        # the event driven loop would look busier than it is
+        print('  event driven: %12.0f %13s' % (event_frames, '-'))
+        print('  %d FPS ticks: %12.0f %13s' % (game.FPS, fixed_frames, '-'))
+        print('  no CPU seconds with the dummy video driver, set SDL_VIDEODRIVER to measure them')
+    else:
+        print('  event driven: %12.0f %13.3f' % (event_frames, event_driven))
+        print('  %d FPS ticks: %12.0f %13.3f' % (game.FPS, fixed_frames, fixed_rate))
+
+
+def blit(count):
+    # prints how many tiles per second are drawn with each way of drawing
+    # - count is how many tiles are drawn with each way
+
+    pygame.init()
+    pygame.display.set_mode((520, 415))
+    surface = pygame.display.get_surface()
+    # image0.bmp to image8.bmp
+    faces = 9
+
+    # the old way, each face is blitted as it was loaded from its file
+    images = []
+    for face_id in range(faces):
+        path = os.path.join(v3.Faces.folder, 'image' + str(face_id) + '.bmp')
+        images.append(pygame.image.load(path))
+    start = time.perf_counter()
+    for i in range(count):
+        surface.blit(images[i % faces], ((i % 4) * 104 + 2, (i // 4 % 4) * 104 + 2))
+    loaded = count / (time.perf_counter() - start)
+
+    # the new way, each face is part of one atlas in the display format
+    atlas = v3.Atlas(faces - 1, images[0].get_width(), surface)
+    start = time.perf_counter()
+    for i in range(count):
+        atlas.blit(surface, i % faces, ((i % 4) * 104 + 2, (i // 4 % 4) * 104 + 2))
+    packed = count / (time.perf_counter() - start)
+    pygame.quit()
+
+    print('tiles drawn per second')
+    print('  loaded bitmaps: %10.0f' % loaded)
+    print('  atlas:          %10.0f' % packed)
+
+
+def startup():
+    # prints the time to the first frame and the time until every face
+    # is loaded, for a small and a big board, with no faces in memory,
+    # first with an empty cache on disk and then with every face on disk
+
+    pygame.init()
+    pygame.display.set_mode((520, 415))
+    surface = pygame.display.get_surface()
+
+    # the first game looks up the font, which is not what is measured
+    v3.Game(surface)
+
+    # the faces are cached in a folder of their own, not the one of the player
+    cache_folder = v3.Faces.cache_folder
+    with tempfile.TemporaryDirectory() as folder:
+        print('start up milliseconds')
+        print('  board    loading    disk cache   first frame   all faces')
+        for rows, cols in [(4, 4), (32, 32)]:
+            for lazy in [False, True]:
+                v3.Faces.cache_folder = os.path.join(folder, '%dx%d-%s' % (rows, cols, lazy))
+                for cached in ['cold', 'warm']:
+                    v3.Faces.clear()
+                    v3.Game.lazy_faces = lazy
+                    game = v3.Game(surface, rows, cols)
+                    game.frame()
+                    while game.faces_loading:
+                        game.frame()
+                    all_faces = time.perf_counter() - game.start_time
+
+                    print('  %-8s %-10s %-10s %13.1f %11.1f' % (
+                        '%dx%d' % (rows, cols), 'lazy' if lazy else 'up front', cached,
+                        game.first_frame_time * 1000, all_faces * 1000))
+    v3.Faces.cache_folder = cache_folder
+    pygame.quit()
+
+
+def resize():
+    # prints the milliseconds per frame while the window is dragged to
+    # every size from small to big and back, with no faces in memory and
+    # then with the faces of the first drag kept in memory
+
+    pygame.init()
+    pygame.display.set_mode((520, 415), pygame.RESIZABLE)
+
+    # faces made while dragging are never saved, so the cache on disk is not used
+    cache_folder = v3.Faces.cache_folder
+    v3.Faces.cache_folder = None
+    v3.Faces.clear()
+    game = v3.Game(pygame.display.get_surface())
+    game.frame()
+
+    widths = list(range(300, 1000, 4)) + list(range(1000, 300, -4))
+    print('resize milliseconds per frame')
+    print('  drag     mean      max     faces kept   MB kept')
+    for drag in ['first', 'second']:
+        times = []
+        for width in widths:
+            start = time.perf_counter()
+            pygame.event.post(pygame.event.Event(pygame.VIDEORESIZE, size = (width, width * 4 // 5)))
+            game.frame()
+            times.append(time.perf_counter() - start)
+        print('  %-6s %8.2f %8.2f %12d %9.1f' % (drag, sum(times) / len(times) * 1000, max(times) * 1000,
+                                                len(v3.Faces.cache), v3.Faces.cache_bytes / 2**20))
+
+    v3.Faces.cache_folder = cache_folder
+    pygame.quit()
+
+
+def replay(logs):
+    # prints the outcome of every recorded game and how many games
+    # per second were replayed
+    # - logs is the list of the names of the input logs
+
+    if not logs:
+        print('no input logs to replay, give them with --logs')
+        return
+
+    pygame.init()
+    pygame.display.set_mode((520, 415))
+    surface = pygame.display.get_surface()
+
+    frames = 0
+    start = time.perf_counter()
+    for path in logs:
+        seed, rows, cols, events = read_log(path)
+        clock = ReplayClock()
+        game = v3.Game(surface, rows, cols, None, seed, clock)
+        v3.replay(game, events, clock)
+        frames += game.frame_counter
+        print('  %s: solved %s, %d moves, %d mismatches, %.3f seconds' % (
+            path, game.engine.is_solved(), game.engine.moves, game.engine.mismatches, game.engine.time))
+    seconds = time.perf_counter() - start
+    pygame.quit()
+
+    print('replayed %d games in %.2f seconds' % (len(logs), seconds))
+    print('  games per second:  %10.1f' % (len(logs) / seconds))
+    print('  frames per second: %10.0f' % (frames / seconds))
+
+
+def loop(frames, versions, baseline_path, save):
+    # plays each version in a new process, prints the results and
+    # returns 1 if any of them is a regression from the baseline
+    # - frames is how many frames each version plays
+    # - versions is the list of versions to play
+    # - baseline_path is the file of the baseline results
+    # - save is if the results are saved as the new baseline
+
+    results = {}
+    for version in versions:
+        child = subprocess.run([sys.executable, os.path.realpath(__file__), '--child', version,
+                                '--frames', str(frames)], capture_output = True, text = True, check = True)
+        results[version] = json.loads(child.stdout.splitlines()[-1])
+
+    print('%d frames of scripted clicks' % frames)
+    print('  version      fps   p50 ms   p99 ms   peak MB   objects   growth   games')
+    for version, result in results.items():
+        print('  %-7s %8.0f %8.3f %8.3f %9.1f %9d %8d %7d' % (
+            version, result['fps'], result['p50'], result['p99'], result['rss'] / 1024,
+            result['objects'], result['growth'], result['games']))
+
+    # a game that keeps what it made every frame is a regression on any machine
+    regressions = []
+    for version, result in results.items():
+        if result['growth'] > TOLERANCE['growth']:
+            regressions.append('%s grew by %d objects in %d frames' % (version, result['growth'], frames))
+
+    if save:
+        save_baseline(baseline_path, results)
+        return report(regressions)
+
+    baseline = load_baseline(baseline_path)
+    if baseline is None:
+        regressions.append('no loop baseline to compare against')
+        return report(regressions)
+
+    # compare every version that has a baseline
+    for version, result in results.items():
+        if version not in baseline:
+            continue
+        old = baseline[version]
+        if result['fps'] < old['fps'] * TOLERANCE['fps']:
+            regressions.append('%s fps %.0f, was %.0f' % (version, result['fps'], old['fps']))
+        if result['p99'] > old['p99'] * TOLERANCE['p99']:
+            regressions.append('%s p99 %.3f ms, was %.3f ms' % (version, result['p99'], old['p99']))
+        if result['rss'] > old['rss'] * TOLERANCE['rss']:
+            regressions.append('%s peak memory %.1f MB, was %.1f MB' % (version, result['rss'] / 1024, old['rss'] / 1024))
+
+    return report(regressions)
+
+
+def coldstart(baseline_path, save, runs = 5):
+    # prints the median milliseconds of new processes that import the
+    # package, show the help and show the first frame of a game, and
+    # returns 1 if any of them is a regression from the baseline
+    # - baseline_path is the file of the baseline results
+    # - save is if the results are saved as the new baseline
+    # - runs is how many processes are timed for each
+
+    # the package is imported from this folder, whether it is installed or not
+    folder = os.path.dirname(os.path.realpath(__file__))
+    results = {}
+    for name, code in COLDSTART.items():
+        times = []
+        for run in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', code], cwd = folder, check = True,
+                           stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+            times.append((time.perf_counter() - start) * 1000)
+        times.sort()
+        results[name] = times[runs // 2]
+
+    # the package and the command must not load pygame before a game starts
+    check = 'import sys, memory, memory.cli, memory.engine, memory.server; print("pygame" in sys.modules)'
+    child = subprocess.run([sys.executable, '-c', check], cwd = folder, check = True,
+                           capture_output = True, text = True)
+    loads_pygame = child.stdout.strip() == 'True'
+
+    print('cold start milliseconds (median of %d processes)' % runs)
+    for name, milliseconds in results.items():
+        print('  %-12s %8.1f' % (name, milliseconds))
+    print('  pygame loaded by importing the package: %s' % ('yes' if loads_pygame else 'no'))
+
+    regressions = []
+    if loads_pygame:
+        regressions.append('importing the package loads pygame')
+    if save:
+        save_baseline(baseline_path, {'coldstart': results})
+        return report(regressions)
+
+    baseline = load_baseline(baseline_path)
+    if baseline is None or 'coldstart' not in baseline:
+        regressions.append('no coldstart baseline to compare against')
+        return report(regressions)
+    for name, milliseconds in results.items():
+        old = baseline['coldstart'].get(name)
+        if old and milliseconds > max(old * TOLERANCE['start'], old + TOLERANCE['start_ms']):
+            regressions.append('%s start %.1f ms, was %.1f ms' % (name, milliseconds, old))
+    return report(regressions)
+
+
+def load_baseline(baseline_path):
+    # returns the saved baseline results, or None if there are none
+    # - baseline_path is the file of the baseline results
+
+    if not os.path.exists(baseline_path):
+        print('no baseline at %s, run with --save-baseline to make one' % baseline_path)
+        return None
+    with open(baseline_path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(baseline_path, results):
+    # saves results in the baseline, keeping the results of the other benchmarks
+    # - baseline_path is the file of the baseline results
+    # - results is the dict of the new results
+
+    baseline = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+    baseline.update(results)
+    with open(baseline_path, 'w') as baseline_file:
+        json.dump(baseline, baseline_file, indent = 2)
+    print('saved the baseline to %s' % baseline_path)
+
+
+def report(regressions):
+    # prints the regressions and returns 1 if there are any
+    # - regressions is the list of the regressions found
+
+    for regression in regressions:
+        print('REGRESSION: ' + regression)
+    if not regressions:
+        print('no regressions from the baseline')
+    return 1 if regressions else 0
+
+
+def loop_one(version, frames):
+    # plays one version for a number of frames with scripted clicks and
+    # returns its results, it is run in a process of its own so the
+    # peak memory is only that of this version
+    # - version is the version to play
+    # - frames is how many frames to play
+
+    module = importlib.import_module('memory.' + version)
+
+    pygame.init()
+    pygame.display.set_mode((520, 415))
+    surface = pygame.display.get_surface()
+
+    # v1 and v2 shuffle with the random module, v3 is given a seed and a
+    # clock that moves one step a frame, so every run plays the same
+    # boards, and a solved board is replaced by a new one so every frame
+    # measured is of a game being played
+    random.seed(0)
+    clock = ReplayClock()
+    game = new_game(module, surface, clock)
+    games = 1
+
+    # the same clicks on the board for every version and every run
+    clicks = random.Random(0)
+    times = []
+    objects_early = 0
+    for frame in range(frames):
+        if not game.continue_game:
+            close_game(game)
+            game = new_game(module, surface, clock)
+            games += 1
+        if frame % 10 == 0:
+            position = (clicks.randrange(418), clicks.randrange(415))
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos = position, button = 1))
+
+        clock.now += 1000 // game.FPS
+        start = time.perf_counter()
+        play_frame(game)
+        times.append(time.perf_counter() - start)
+
+        # objects made after the start up should not pile up
+        if frame == frames // 10:
+            gc.collect()
+            objects_early = len(gc.get_objects())
+
+    close_game(game)
+    gc.collect()
+    objects = len(gc.get_objects())
+    pygame.quit()
+
+    times.sort()
+    return {'fps': frames / sum(times),
+            'p50': times[len(times) // 2] * 1000,
+            'p99': times[len(times) * 99 // 100] * 1000,
+            'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            'objects': objects,
+            'growth': objects - objects_early,
+            'games': games}
+
+
+def new_game(module, surface, clock):
+    # returns a new game of a version on the same board every run
+    # - module is the module of the version
+    # - surface is the display window surface object
+    # - clock is the ReplayClock a game of version 3 is timed with
+
+    if module.__name__ == 'memory.v3':
+        return module.Game(surface, seed = 0, clock = clock)
+    return module.Game(surface)
+
+
+def close_game(game):
+    # stops the loading threads of a game that is no longer played
+    # - game is the Game of any version
+
+    if hasattr(game, 'atlas'):
+        game.atlas.close()
+
+
+def play_frame(game):
+    # plays one frame of any version, without waiting for the frame rate
+    # - game is the Game to play a frame of
+
+    # version 3 has a frame method, the older versions do it in play
+    if hasattr(game, 'frame'):
+        game.frame()
+        return
+
+    game.handle_events()
+    game.draw()
+    if game.continue_game:
+        game.update()
+        game.decide_continue()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,12 @@
+# Memory - Andrew Li
+# A matching game of tiles, played with the memory command.
+# v1, v2 and v3 are the versions of the game, engine has the rules of
+# the game without pygame and the other modules are built on them:
+# animation, profile and replay for the game, multiplayer for turns,
+# solver for hints and bots, scores for the best results, snapshot for
+# saving and resuming, batch and tournament for simulating many games,
+# server and load for playing over the network.
+# Only v1, v2 and v3 use pygame, they draw the game and turn the input
+# into events, the other modules do not import it. Nothing is imported
+# here, so importing the package does not load pygame or any image,
+# only the modules that are used load them.
@@ -0,0 +1,6 @@
+# Memory - Andrew Li
+# Runs the memory command, python -m memory v3 --rows 6 --cols 6
+
+from .cli import main
+
+main()
@@ -0,0 +1,80 @@
+# Memory Animation - Andrew Li
+# Keeps track of the tiles of v3.py that are being flipped over.
+# Only the tiles that are flipping are kept, so the work of a step and
+# of drawing grows with the number of flips, not the size of the board.
+# The flips move on in fixed steps and are drawn part of the way between
+# the last two steps, so they look smooth however long a frame takes.
+
+
+# User-defined classes
+
+class FlipAnimator:
+    # An object in this class moves the tiles that are flipping from
+    # face down (0.0) to face up (1.0) or back over.
+
+    def __init__(self, duration = 0.25):
+        # Initialize a FlipAnimator.
+        # - self is the FlipAnimator to initialize
+        # - duration is how many seconds a whole flip takes
+
+        self.duration = duration
+
+        # how far over each flipping tile was at the last two steps
+        # and where it is going, by the index of the tile
+        self.previous = {}
+        self.progress = {}
+        self.target = {}
+
+    def start(self, index, face_up):
+        # starts flipping a tile, a tile that is already flipping turns
+        # around from where it is
+        # - self is the FlipAnimator
+        # - index is the index of the tile
+        # - face_up is if the tile ends face up
+
+        target = 1.0 if face_up else 0.0
+        if index not in self.progress:
+            self.previous[index] = 1.0 - target
+            self.progress[index] = 1.0 - target
+        self.target[index] = target
+
+    def step(self, dt):
+        # moves every flipping tile on by one step
+        # - self is the FlipAnimator
+        # - dt is the number of seconds in a step
+
+        delta = dt / self.duration if self.duration else 1.0
+        for index, progress in self.progress.items():
+            self.previous[index] = progress
+            target = self.target[index]
+            if progress < target:
+                self.progress[index] = min(progress + delta, target)
+            elif progress > target:
+                self.progress[index] = max(progress - delta, target)
+
+    def value(self, index, alpha):
+        # returns how far over a flipping tile is drawn
+        # - self is the FlipAnimator
+        # - index is the index of the tile
+        # - alpha is how far the frame is between the last step and the next
+
+        previous = self.previous[index]
+        return previous + (self.progress[index] - previous) * alpha
+
+    def active(self):
+        # returns the indexes of the tiles that are flipping
+        # - self is the FlipAnimator
+
+        return self.progress.keys()
+
+    def drop_finished(self):
+        # forgets the tiles that ended their flip at the last step, call
+        # this once they have been drawn where they ended
+        # - self is the FlipAnimator
+
+        finished = [index for index, progress in self.progress.items()
+                    if progress == self.target[index] and self.previous[index] == progress]
+        for index in finished:
+            del self.previous[index]
+            del self.progress[index]
+            del self.target[index]
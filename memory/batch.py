@@ -0,0 +1,218 @@
+# Memory Batch - Andrew Li
+# Plays many games of memory (the rules of engine.py) at once.
+# Every game of a batch is a row of NumPy arrays, so one move of every
+# game is a handful of array operations instead of a Python loop.
+# This is used to find how many moves it takes to solve a board for
+# different players:
+# random  - flips two face down tiles at random
+# perfect - remembers every tile it has seen
+# limited - only remembers the tiles it saw in its last few flips
+#
+# python -m memory.batch --games 1000000 --rows 4 --cols 4 --strategy limited --memory 6
+
+# import numpy for the arrays, argparse for the options and time to
+# report how fast the games were played
+import argparse
+import time
+
+import numpy as np
+
+
+# names of the players in the order they are listed
+STRATEGIES = ['random', 'perfect', 'limited']
+
+
+# User-defined functions
+
+def main():
+    # parse the options, play the games and print how many moves they took
+    parser = argparse.ArgumentParser(description='Play many games of Memory at once')
+    parser.add_argument('--games', type=int, default=100000, help='number of games (default: 100000)')
+    parser.add_argument('--rows', type=int, default=4, help='number of rows of tiles (default: 4)')
+    parser.add_argument('--cols', type=int, default=4, help='number of columns of tiles (default: 4)')
+    parser.add_argument('--strategy', choices=STRATEGIES, default='perfect', help='player (default: perfect)')
+    parser.add_argument('--memory', type=int, default=8,
+                        help='flips the limited player remembers (default: 8)')
+    parser.add_argument('--batch', type=int, default=100000, help='games played at once (default: 100000)')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the random numbers')
+    args = parser.parse_args()
+    if args.games < 1 or args.batch < 1:
+        parser.error('--games and --batch must be at least 1')
+    if args.rows < 1 or args.cols < 1 or args.rows * args.cols % 2:
+        parser.error('a board of %dx%d has an odd number of tiles' % (args.rows, args.cols))
+    if args.memory < 0:
+        parser.error('--memory must be at least 0')
+
+    rng = np.random.default_rng(args.seed)
+    memory = args.memory if args.strategy == 'limited' else None
+
+    start = time.perf_counter()
+    moves = []
+    for first in range(0, args.games, args.batch):
+        batch = BatchEngine(min(args.batch, args.games - first), args.rows, args.cols, rng)
+        batch.play(args.strategy, memory)
+        moves.append(batch.moves)
+    moves = np.concatenate(moves)
+    seconds = time.perf_counter() - start
+
+    print('%d games of %dx%d, %s player' % (args.games, args.rows, args.cols, args.strategy))
+    print('  games per second: %.0f' % (args.games / seconds))
+    print_distribution(moves)
+
+
+def print_distribution(moves):
+    # prints the mean, the percentiles and a histogram of the moves to solve
+    # - moves is the array of the number of moves each game took
+
+    print('  moves to solve: mean %.2f, min %d, p50 %d, p90 %d, p99 %d, max %d' % (
+        moves.mean(), moves.min(), np.percentile(moves, 50), np.percentile(moves, 90),
+        np.percentile(moves, 99), moves.max()))
+
+    # one line per bucket of moves, the bar is the share of the games
+    counts = np.bincount(moves)
+    bucket = max(1, (len(counts) + 19) // 20)
+    for low in range(moves.min() - moves.min() % bucket, len(counts), bucket):
+        share = counts[low:low + bucket].sum() / len(moves)
+        print('  %4d-%-4d %6.2f%% %s' % (low, low + bucket - 1, share * 100, '#' * int(share * 100)))
+
+
+# User-defined classes
+
+class BatchEngine:
+    # An object in this class represents a batch of games played at once.
+
+    def __init__(self, games, rows = 4, cols = 4, rng = None):
+        # Initialize a BatchEngine.
+        # - self is the BatchEngine to initialize
+        # - games is the number of games
+        # - rows is the number of rows of tiles
+        # - cols is the number of columns of tiles
+        # - rng is the numpy.random.Generator used, a new one if None
+
+        # every tile needs a pair
+        if rows * cols % 2:
+            raise ValueError('a board of %dx%d has an odd number of tiles' % (rows, cols))
+
+        self.games = games
+        self.cells = rows * cols
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.index = np.arange(games)
+
+        # every board is a random order of the tiles, the tiles at
+        # positions 2k and 2k+1 of the order are a pair with face k
+        order = self.rng.random((games, self.cells)).argsort(axis = 1)
+        self.faces = np.empty_like(order)
+        self.faces[self.index[:, None], order] = np.arange(self.cells) // 2
+
+        # partner is the index of the other tile with the same face
+        self.partner = np.empty_like(order)
+        self.partner[self.index[:, None], order] = order[:, np.arange(self.cells) ^ 1]
+
+        # matched tiles, the flip each tile was last seen at (-1 for never)
+        # and the number of flips of each game so far
+        self.matched = np.zeros((games, self.cells), dtype = bool)
+        self.seen_at = np.full((games, self.cells), -1, dtype = np.int64)
+        self.flips = np.zeros(games, dtype = np.int64)
+
+        # the counts that make up the score of each game
+        self.moves = np.zeros(games, dtype = np.int64)
+        self.mismatches = np.zeros(games, dtype = np.int64)
+        self.solved = np.zeros(games, dtype = bool)
+
+    def pick(self, mask):
+        # returns one random tile of each game out of the tiles in mask,
+        # games with no tile in mask get tile 0
+        # - self is the BatchEngine
+        # - mask is the (games, cells) array of tiles to pick from
+
+        scores = self.rng.random(mask.shape)
+        scores[~mask] = -1
+        return scores.argmax(axis = 1)
+
+    def random_move(self):
+        # returns the two tiles each game flips when the player
+        # remembers nothing
+        # - self is the BatchEngine
+
+        face_down = ~self.matched
+        first = self.pick(face_down)
+        face_down[self.index, first] = False
+        second = self.pick(face_down)
+        return first, second
+
+    def memory_move(self, memory = None):
+        # returns the two tiles each game flips when the player remembers
+        # the tiles it has seen, a known pair is flipped straight away,
+        # otherwise a new tile is flipped and then its partner if it is known
+        # or else another new tile
+        # - self is the BatchEngine
+        # - memory is the number of flips the player remembers, all if None
+
+        # tiles the player knows the face of
+        known = ~self.matched & (self.seen_at >= 0)
+        if memory is not None:
+            known &= self.seen_at >= (self.flips - memory)[:, None]
+        known_pair = known & known[self.index[:, None], self.partner]
+        unknown = ~self.matched & ~known
+
+        # games that know a pair flip it, the others flip a new tile
+        has_pair = known_pair.any(axis = 1)
+        first = np.where(has_pair, known_pair.argmax(axis = 1), self.pick(unknown))
+
+        # the second tile is the partner if the player knows where it is
+        partner = self.partner[self.index, first]
+        unknown[self.index, first] = False
+        knows_partner = has_pair | known[self.index, partner]
+        second = np.where(knows_partner, partner, self.pick(unknown))
+        return first, second
+
+    def step(self, first, second):
+        # plays one move of every game that is not solved yet
+        # - self is the BatchEngine
+        # - first is the first tile each game flips
+        # - second is the second tile each game flips
+
+        playing = self.index[~self.solved]
+        first = first[playing]
+        second = second[playing]
+
+        # the player sees both tiles
+        self.seen_at[playing, first] = self.flips[playing]
+        self.seen_at[playing, second] = self.flips[playing] + 1
+        self.flips[playing] += 2
+        self.moves[playing] += 1
+
+        # a pair stays face up, a wrong pair is flipped back
+        match = self.faces[playing, first] == self.faces[playing, second]
+        self.matched[playing[match], first[match]] = True
+        self.matched[playing[match], second[match]] = True
+        self.mismatches[playing[~match]] += 1
+
+        self.solved[playing] = self.matched[playing].all(axis = 1)
+
+    def play(self, strategy, memory = None, max_moves = None):
+        # plays every game until it is solved, or for max_moves moves
+        # - self is the BatchEngine
+        # - strategy is the name of the player, one of STRATEGIES
+        # - memory is the number of flips the limited player remembers
+        # - max_moves is the most moves played, no limit if None
+
+        if strategy not in STRATEGIES:
+            raise ValueError('unknown strategy %r' % strategy)
+        if strategy == 'perfect':
+            memory = None
+        elif strategy == 'limited' and memory is None:
+            raise ValueError('the limited player needs a memory size')
+
+        played = 0
+        while not self.solved.all() and (max_moves is None or played < max_moves):
+            if strategy == 'random':
+                first, second = self.random_move()
+            else:
+                first, second = self.memory_move(memory)
+            self.step(first, second)
+            played += 1
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# Memory - Andrew Li
+# The memory command, which plays one of the versions of the game:
+# v1 - the tiles are shown face up in a random order
+# v2 - the tiles are flipped by clicking on them until every pair is found
+# v3 - any size of board, a timer, best results, more players, bots, hints,
+#      save and resume, record and replay (default)
+# The version is only imported once it is picked and its options are
+# read here, so the command starts, shows its help or reports a wrong
+# option without loading pygame or the images.
+#
+# memory v3 --rows 6 --cols 6
+
+# import sys for the command line and importlib for the versions,
+# argparse is only imported when the options are read
+import sys
+import importlib
+
+
+# versions of the game, the last is played if none is given
+VERSIONS = ['v1', 'v2', 'v3']
+
+# the most rows or columns of tiles, a 64x64 board is the biggest a
+# server game may be and still has tiles of a few pixels in the window
+MAX_SIDE = 64
+
+
+# User-defined functions
+
+def main(argv = None):
+    # plays the version of the game given first on the command line,
+    # the rest of the command line are the options of that version
+    # - argv is the list of the arguments, the command line if None
+
+    if argv is None:
+        argv = sys.argv[1:]
+
+    version = VERSIONS[-1]
+    if argv and argv[0] in VERSIONS:
+        version = argv[0]
+        argv = argv[1:]
+
+    # the first versions have no options
+    if version == 'v3':
+        args = parse_options(argv)
+    elif argv:
+        sys.exit('usage: memory [%s] [options]\nmemory %s has no options' % ('|'.join(VERSIONS), version))
+
+    module = importlib.import_module('.' + version, __package__)
+    if version == 'v3':
+        module.start(args)
+    else:
+        module.main()
+
+
+def parse_options(argv = None):
+    # returns the options of version 3 read from a command line
+    # - argv is the list of the options, the command line if None
+
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='memory', usage='%(prog)s [v1|v2|v3] [options]',
+                                     description='Memory matching game',
+                                     epilog='memory v1 and memory v2 play the first two versions, which have no options')
+    parser.add_argument('--rows', type=int, default=4, help='number of rows of tiles, at most %d (default: 4)' % MAX_SIDE)
+    parser.add_argument('--cols', type=int, default=4, help='number of columns of tiles, at most %d (default: 4)' % MAX_SIDE)
+    parser.add_argument('--profile', action='store_true',
+                        help='time every frame, F3 shows the times on screen')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='time every frame and write the times to FILE (.csv or .json) on exit')
+    parser.add_argument('--seed', type=int, help='seed of the shuffle of the board (default: random)')
+    parser.add_argument('--record', metavar='FILE', help='write the clicks to FILE to replay the game later')
+    parser.add_argument('--replay', metavar='FILE', help='play the game recorded in FILE')
+    parser.add_argument('--speed', type=float, default=0,
+                        help='how many times faster than real time a replay is, 0 for as fast as it can (default: 0)')
+    parser.add_argument('--players', type=int, default=1,
+                        help='number of players taking turns on this computer (default: 1)')
+    parser.add_argument('--bots', type=int, default=0,
+                        help='how many of the players, the last ones, are played by the computer (default: 0)')
+    parser.add_argument('--scores', metavar='FILE',
+                        help='file the results of solved games are kept in (default: in the data folder of the user)')
+    parser.add_argument('--no-scores', action='store_true', help='do not keep the result of the game')
+    parser.add_argument('--resume', action='store_true',
+                        help='go on with the saved game, which has its own board and players')
+    parser.add_argument('--snapshot', metavar='FILE',
+                        help='file the game is saved to after every move (default: in the state folder of the user)')
+    parser.add_argument('--no-save', action='store_true', help='do not save the game')
+    parser.add_argument('--overwrite-save', action='store_true',
+                        help='save a new game over the saved one instead of keeping it for --resume')
+    args = parser.parse_args(argv)
+    if not (1 <= args.rows <= MAX_SIDE and 1 <= args.cols <= MAX_SIDE):
+        parser.error('--rows and --cols must be from 1 to %d' % MAX_SIDE)
+    if args.rows * args.cols % 2:
+        parser.error('a board of %dx%d has an odd number of tiles' % (args.rows, args.cols))
+    # the seed is kept in the signed 64 bit fields of the input log
+    if args.seed is not None and not 0 <= args.seed < 2**63:
+        parser.error('--seed must be from 0 to 2**63 - 1')
+    # the players and whose turn it is are each kept in a byte of a snapshot
+    if not 1 <= args.players <= 255:
+        parser.error('--players must be from 1 to 255')
+    if not 0 <= args.bots <= args.players:
+        parser.error('--bots must be from 0 to the number of players')
+    if (args.players > 1 or args.bots) and (args.record or args.replay):
+        parser.error('--record and --replay are for one player and no bots')
+    if args.resume and (args.record or args.replay):
+        parser.error('--resume cannot be recorded or replayed')
+    return args
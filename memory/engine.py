@@ -0,0 +1,131 @@
+# Memory Engine - Andrew Li
+# The rules of the matching game of v3.py without pygame.
+# A board of rows x cols tiles holds every face twice in a random order.
+# Flipping two tiles keeps them face up if their faces match, otherwise
+# they stay shown for reveal_delay seconds and are flipped back over.
+# The game is solved when every tile is face up.
+# Since nothing here draws or reads the clock, games can be played by
+# code (tests, bots, simulations) as fast as the computer can go.
+
+# import random for shuffling the board and array for
+# keeping the faces small
+import random
+from array import array
+
+
+# User-defined classes
+
+class MemoryEngine:
+    # An object in this class represents the state of one game.
+    # Everything is kept on the object in compact types, so a process
+    # can hold many games at once.
+
+    __slots__ = ['rows', 'cols', 'reveal_delay', 'faces', 'state', 'remaining',
+                 'first', 'pending', 'hide_time', 'time', 'moves', 'matches', 'mismatches']
+
+    def __init__(self, rows = 4, cols = 4, reveal_delay = 1.0, rng = None, faces = None):
+        # Initialize a MemoryEngine.
+        # - self is the MemoryEngine to initialize
+        # - rows is the number of rows of tiles
+        # - cols is the number of columns of tiles
+        # - reveal_delay is how many seconds a wrong pair stays shown
+        # - rng is the random.Random used to shuffle, the random module if None
+        # - faces is the face number of every tile, shuffled pairs if None
+
+        # every tile needs a pair
+        if rows * cols % 2:
+            raise ValueError('a board of %dx%d has an odd number of tiles' % (rows, cols))
+
+        self.rows = rows
+        self.cols = cols
+        self.reveal_delay = reveal_delay
+
+        # since the tiles comes in pairs,
+        # add two of each face, then shuffle
+        if faces is None:
+            faces = list(range(1, rows * cols // 2 + 1)) * 2
+            (rng or random).shuffle(faces)
+        elif len(faces) != rows * cols:
+            raise ValueError('%d faces do not fill a board of %dx%d' % (len(faces), rows, cols))
+        self.faces = array('H', faces)
+
+        # state of every tile (0 = face down, 1 = face up) and the
+        # number of pairs that are not matched yet
+        self.state = bytearray(rows * cols)
+        self.remaining = rows * cols // 2
+
+        # the first tile of the pair being flipped, None if no tile is
+        self.first = None
+
+        # a wrong pair stays shown until hide_time, None if there is no pair
+        self.pending = None
+        self.hide_time = None
+
+        # seconds played and the counts that make up the score
+        self.time = 0.0
+        self.moves = 0
+        self.matches = 0
+        self.mismatches = 0
+
+    def flip(self, index):
+        # flips a tile face up and returns True, or returns False if the
+        # tile is already face up, flipping while a wrong pair is shown
+        # hides the pair straight away
+        # - self is the MemoryEngine
+        # - index is the index of the tile
+
+        if self.pending is not None:
+            self.hide_pair()
+
+        if self.state[index]:
+            return False
+        self.state[index] = 1
+
+        # if it is the first tile of pair, remember the tile
+        if self.first is None:
+            self.first = index
+            return True
+
+        # the second tile finishes the move, a wrong pair is shown for a while
+        self.moves += 1
+        if self.faces[self.first] == self.faces[index]:
+            self.matches += 1
+            self.remaining -= 1
+        else:
+            self.mismatches += 1
+            self.pending = (self.first, index)
+            self.hide_time = self.time + self.reveal_delay
+        self.first = None
+        return True
+
+    def hide_pair(self):
+        # flips the wrong pair that is shown back over
+        # - self is the MemoryEngine
+
+        first, second = self.pending
+        self.state[first] = 0
+        self.state[second] = 0
+        self.pending = None
+        self.hide_time = None
+
+    def tick(self, dt):
+        # moves the time of the game on, the time stops once it is solved
+        # - self is the MemoryEngine
+        # - dt is the number of seconds that passed
+
+        if not self.is_solved():
+            self.time += dt
+        if self.pending is not None and self.time >= self.hide_time:
+            self.hide_pair()
+
+    def is_solved(self):
+        # returns if every tile is face up, which is when every pair is matched
+        # - self is the MemoryEngine
+
+        return self.remaining == 0
+
+    def score(self):
+        # returns the number of pairs matched
+        # - self is the MemoryEngine
+
+        return self.matches
@@ -0,0 +1,169 @@
+# Memory Load - Andrew Li
+# Load generator for server.py. It connects many players at
+# once, each plays games on the server with the perfect player of
+# batch.py (it remembers every tile it has seen), and it prints
+# how many commands per second the server answered and how long the
+# answers took.
+#
+# python -m memory.load --clients 1000 --games 10
+# python -m memory.load --serve --clients 1000    (the server runs in this process)
+
+# import asyncio for the players, argparse for the options, time for
+# the clock, random for the order the tiles are tried in and resource
+# for the number of connections that can be open
+import asyncio
+import argparse
+import time
+import random
+import resource
+
+from .server import MemoryServer
+
+
+# User-defined functions
+
+def main():
+    # parse the options, play the games and print the results
+    parser = argparse.ArgumentParser(description='Load generator for the Memory server')
+    parser.add_argument('--host', default='127.0.0.1', help='address of the server (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='port of the server (default: 8765)')
+    parser.add_argument('--serve', action='store_true',
+                        help='run the server in this process on a free port instead')
+    parser.add_argument('--clients', type=int, default=1000, help='players connected at once (default: 1000)')
+    parser.add_argument('--games', type=int, default=10, help='games each player plays (default: 10)')
+    parser.add_argument('--rows', type=int, default=4, help='number of rows of tiles (default: 4)')
+    parser.add_argument('--cols', type=int, default=4, help='number of columns of tiles (default: 4)')
+    parser.add_argument('--seed', type=int, default=None, help='seed of the boards and the players')
+    args = parser.parse_args()
+
+    # every player needs a connection, and its other end if the server is here too
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    needed = args.clients * (2 if args.serve else 1) + 64
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(needed, hard), hard))
+
+    asyncio.run(run(args))
+
+
+async def run(args):
+    # plays the games of every player at once and prints the results
+    # - args is the parsed options
+
+    server = None
+    host, port = args.host, args.port
+    if args.serve:
+        local_server = MemoryServer()
+        server = await local_server.start('127.0.0.1', 0)
+        host, port = server.sockets[0].getsockname()[:2]
+
+    rng = random.Random(args.seed)
+    latencies = []
+    start = time.perf_counter()
+    moves = await asyncio.gather(*[play(host, port, args.games, args.rows, args.cols,
+                                        rng.randrange(2**32), latencies)
+                                   for client in range(args.clients)])
+    seconds = time.perf_counter() - start
+
+    # how long the server itself spent on the commands
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'stats\n')
+    connections, sessions, rooms, commands, busy = (await reader.readline()).split()[1:]
+    writer.close()
+    await writer.wait_closed()
+
+    # the server here stops once it has seen every player leave
+    if server:
+        while local_server.connections:
+            await asyncio.sleep(0.01)
+        server.close()
+        await server.wait_closed()
+
+    games = args.clients * args.games
+    print('%d players, %d games of %dx%d in %.2f seconds' % (args.clients, games, args.rows, args.cols, seconds))
+    print('  games per second:    %10.0f' % (games / seconds))
+    print('  commands per second: %10.0f' % (len(latencies) / seconds))
+    print('  moves per game:      %10.2f' % (sum(moves) / games))
+    print('  server us per command: %8.2f' % (float(busy) / max(int(commands), 1) * 1e6))
+    print_latencies(latencies)
+
+
+def print_latencies(latencies):
+    # prints the percentiles of the time from sending a command to its answer
+    # - latencies is the list of the times in seconds
+
+    latencies.sort()
+    count = len(latencies)
+    print('  latency us: ' + ', '.join('p%s %.0f' % (p, latencies[min(count - 1, int(count * p / 100))] * 1e6)
+                                      for p in (50, 90, 99, 99.9)) + ', max %.0f' % (latencies[-1] * 1e6))
+
+
+async def play(host, port, games, rows, cols, seed, latencies):
+    # connects one player and plays its games, returns the total number of moves
+    # - host is the address of the server
+    # - port is the port of the server
+    # - games is the number of games to play
+    # - rows is the number of rows of tiles
+    # - cols is the number of columns of tiles
+    # - seed is the seed of the boards and of the player
+    # - latencies is the list the times of the answers are added to
+
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = random.Random(seed)
+
+    async def send(line):
+        # sends a command and returns the words of its answer
+        start = time.perf_counter()
+        writer.write(line)
+        reply = await reader.readline()
+        latencies.append(time.perf_counter() - start)
+        words = reply.split()
+        if not words or words[0] != b'ok':
+            raise RuntimeError('server answered %r to %r' % (reply, line))
+        return words[1:]
+
+    moves = 0
+    for game in range(games):
+        session_id = int((await send(b'new %d %d %d\n' % (rows, cols, rng.randrange(2**32))))[0])
+
+        async def flip(index):
+            # flips a tile and returns its face and the pairs left
+            face, remaining = await send(b'flip %d %d\n' % (session_id, index))
+            return int(face), int(remaining)
+
+        # the tiles never seen in a random order, and where the faces
+        # seen but not matched yet are
+        unseen = list(range(rows * cols))
+        rng.shuffle(unseen)
+        seen = {}
+        remaining = rows * cols // 2
+        while remaining:
+            moves += 1
+            pair = next((indexes for indexes in seen.values() if len(indexes) == 2), None)
+            if pair:
+                await flip(pair[0])
+                face, remaining = await flip(pair[1])
+                del seen[face]
+                continue
+
+            first = unseen.pop()
+            face, remaining = await flip(first)
+            if face in seen:
+                face, remaining = await flip(seen.pop(face)[0])
+                continue
+
+            second = unseen.pop()
+            second_face, remaining = await flip(second)
+            if second_face == face:
+                continue
+            seen[face] = [first]
+            seen.setdefault(second_face, []).append(second)
+
+        await send(b'end %d\n' % session_id)
+
+    writer.close()
+    await writer.wait_closed()
+    return moves
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+# Memory Multiplayer - Andrew Li
+# Turn based memory (the rules of engine.py) for two or more
+# players, on one computer (memory --players 2) or over the
+# network (server.py).
+# The TurnEngine is the state everyone agrees on: the board, the pairs
+# each player matched and whose turn it is. A player who matches a pair
+# goes again, a wrong pair passes the turn to the next player.
+# Every flip makes a delta of five numbers: the player, the tile, its
+# face, what the flip did and whose turn is next. Players that are not
+# sent the whole board keep a BoardView up to date from the deltas, so
+# a move costs the same to send however big the board is.
+
+# import array for keeping the scores and faces small
+from array import array
+
+
+# what a flip did: the first tile of a pair, a matched pair or a wrong pair
+FIRST = 0
+MATCH = 1
+MISMATCH = 2
+
+
+# User-defined functions
+
+def encode_delta(delta):
+    # returns a delta as the words of a line
+    # - delta is the (player, index, face, result, turn) of a flip
+
+    return b'%d %d %d %d %d' % delta
+
+
+def decode_delta(words):
+    # returns the delta in the words of a line
+    # - words is the list of the five words of the delta, as bytes
+
+    player, index, face, result, turn = [int(word) for word in words]
+    return player, index, face, result, turn
+
+
+# User-defined classes
+
+class TurnEngine:
+    # An object in this class is the state of a game with many players.
+
+    __slots__ = ['engine', 'players', 'scores', 'turn']
+
+    def __init__(self, players, engine):
+        # Initialize a TurnEngine.
+        # - self is the TurnEngine to initialize
+        # - players is the number of players
+        # - engine is the MemoryEngine with the board
+
+        if players < 1:
+            raise ValueError('a game needs at least one player')
+        self.engine = engine
+        self.players = players
+        self.scores = array('H', [0]) * players
+        self.turn = 0
+
+    def flip(self, player, index):
+        # flips a tile for a player and returns the delta of the flip, or
+        # None if it is not the turn of the player or the tile is face up
+        # - self is the TurnEngine
+        # - player is the number of the player, from 0
+        # - index is the index of the tile
+
+        engine = self.engine
+        if player != self.turn or engine.is_solved():
+            return None
+
+        first = engine.first
+        if not engine.flip(index):
+            return None
+
+        # a match scores and the player goes again, a wrong pair ends the turn
+        if first is None:
+            result = FIRST
+        elif engine.pending is None:
+            result = MATCH
+            self.scores[player] += 1
+        else:
+            result = MISMATCH
+            self.turn = (self.turn + 1) % self.players
+        return player, index, engine.faces[index], result, self.turn
+
+    def winners(self):
+        # returns the list of the players with the most pairs
+        # - self is the TurnEngine
+
+        best = max(self.scores)
+        return [player for player in range(self.players) if self.scores[player] == best]
+
+
+class BoardView:
+    # An object in this class is what a player knows of a game, kept
+    # up to date from the deltas of the flips, a face is 0 until the
+    # tile has been seen.
+
+    __slots__ = ['rows', 'cols', 'players', 'faces', 'state', 'scores', 'turn',
+                 'first', 'pending', 'remaining']
+
+    def __init__(self, rows, cols, players):
+        # Initialize a BoardView.
+        # - self is the BoardView to initialize
+        # - rows is the number of rows of tiles
+        # - cols is the number of columns of tiles
+        # - players is the number of players
+
+        self.rows = rows
+        self.cols = cols
+        self.players = players
+        self.faces = array('H', [0]) * (rows * cols)
+        self.state = bytearray(rows * cols)
+        self.scores = array('H', [0]) * players
+        self.turn = 0
+        self.first = None
+        self.pending = None
+        self.remaining = rows * cols // 2
+
+    def apply(self, delta):
+        # changes the view by the delta of a flip, the wrong pair shown
+        # is flipped back over by the next flip like in the engine
+        # - self is the BoardView
+        # - delta is the (player, index, face, result, turn) of a flip
+
+        player, index, face, result, turn = delta
+        if self.pending is not None:
+            for shown in self.pending:
+                self.state[shown] = 0
+            self.pending = None
+
+        self.state[index] = 1
+        self.faces[index] = face
+        if result == FIRST:
+            self.first = index
+        else:
+            if result == MATCH:
+                self.scores[player] += 1
+                self.remaining -= 1
+            else:
+                self.pending = (self.first, index)
+            self.first = None
+        self.turn = turn
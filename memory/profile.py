@@ -0,0 +1,138 @@
+# Memory Profile - Andrew Li
+# Times the phases of every frame of the game loop of v3.py.
+# The times of the last frames are kept in a ring buffer, from which the
+# overlay of the game shows the frame rate and frame time percentiles,
+# and which can be written out as a CSV or JSON trace.
+
+# import time for the clock, sys for the allocated blocks and
+# csv, json and array for keeping and writing the trace
+import time
+import sys
+import csv
+import json
+from array import array
+
+
+# the phases of a frame in the order they run
+PHASES = ['handle_events', 'update', 'draw', 'text', 'display.update']
+
+
+# User-defined classes
+
+class FrameProfiler:
+    # An object in this class records how long each phase of the
+    # last frames took.
+
+    def __init__(self, size = 600):
+        # Initialize a FrameProfiler.
+        # - self is the FrameProfiler to initialize
+        # - size is the number of frames kept
+
+        self.size = size
+
+        # one ring buffer of seconds per phase, plus the time each frame
+        # started at and the net number of blocks it allocated
+        self.phases = [array('d', [0.0]) * size for phase in PHASES]
+        self.starts = array('d', [0.0]) * size
+        self.allocations = array('q', [0]) * size
+
+        # the slot of the current frame and the number of frames recorded
+        self.slot = 0
+        self.frames = 0
+        self.lap_time = 0.0
+        self.blocks = 0
+
+    def begin_frame(self):
+        # starts timing a new frame
+        # - self is the FrameProfiler
+
+        self.slot = self.frames % self.size
+        for times in self.phases:
+            times[self.slot] = 0.0
+        self.lap_time = time.perf_counter()
+        self.starts[self.slot] = self.lap_time
+        self.blocks = sys.getallocatedblocks()
+
+    def lap(self, phase):
+        # adds the time since the last lap to a phase of the frame
+        # - self is the FrameProfiler
+        # - phase is the index of the phase in PHASES
+
+        now = time.perf_counter()
+        self.phases[phase][self.slot] += now - self.lap_time
+        self.lap_time = now
+
+    def end_frame(self):
+        # finishes timing the frame
+        # - self is the FrameProfiler
+
+        self.allocations[self.slot] = sys.getallocatedblocks() - self.blocks
+        self.frames += 1
+
+    def recorded(self):
+        # returns the slots of the recorded frames, oldest first
+        # - self is the FrameProfiler
+
+        if self.frames <= self.size:
+            return range(self.frames)
+        first = self.frames % self.size
+        return [(first + i) % self.size for i in range(self.size)]
+
+    def frame_time(self, slot):
+        # returns how long all the phases of a frame took in seconds
+        # - self is the FrameProfiler
+        # - slot is the slot of the frame
+
+        return sum(times[slot] for times in self.phases)
+
+    def summary(self):
+        # returns the frame rate, the 50th, 90th and 99th percentile frame
+        # times in milliseconds and the mean allocated blocks per frame
+        # - self is the FrameProfiler
+
+        slots = self.recorded()
+        if len(slots) < 2:
+            return 0.0, 0.0, 0.0, 0.0, 0.0
+
+        times = sorted(self.frame_time(slot) for slot in slots)
+        elapsed = self.starts[slots[-1]] - self.starts[slots[0]]
+        fps = (len(slots) - 1) / elapsed if elapsed else 0.0
+        p50, p90, p99 = [times[min(len(times) - 1, len(times) * p // 100)] * 1000 for p in (50, 90, 99)]
+        allocations = sum(self.allocations[slot] for slot in slots) / len(slots)
+        return fps, p50, p90, p99, allocations
+
+    def lines(self):
+        # returns the lines of text shown by the overlay
+        # - self is the FrameProfiler
+
+        fps, p50, p90, p99, allocations = self.summary()
+        return ['fps %.0f' % fps,
+                'p50 %.2fms' % p50,
+                'p90 %.2fms' % p90,
+                'p99 %.2fms' % p99,
+                'alloc %+.1f' % allocations]
+
+    def rows(self):
+        # returns a row of the trace for each recorded frame, oldest first
+        # - self is the FrameProfiler
+
+        for slot in self.recorded():
+            row = {'start': self.starts[slot]}
+            for phase, times in zip(PHASES, self.phases):
+                row[phase] = times[slot]
+            row['allocations'] = self.allocations[slot]
+            yield row
+
+    def dump(self, path):
+        # writes the trace to a file, as JSON if its name ends in .json
+        # and as CSV otherwise
+        # - self is the FrameProfiler
+        # - path is the name of the file
+
+        with open(path, 'w', newline = '') as trace:
+            if path.endswith('.json'):
+                json.dump({'phases': PHASES, 'frames': list(self.rows())}, trace)
+            else:
+                writer = csv.DictWriter(trace, ['start'] + PHASES + ['allocations'])
+                writer.writeheader()
+                writer.writerows(self.rows())
@@ -0,0 +1,107 @@
+# Memory Replay - Andrew Li
+# Records the clicks, the resizes of the window and the close of a game
+# of v3.py to a log, and reads the log back so the game can be
+# played again exactly.
+# A log starts with a header of the seed and size of the board, then
+# has one 9 byte record per event: the milliseconds since the game
+# started, the kind of event and the x and y coords of a click or the
+# width and height of the window.
+# The game turns the records into events.
+
+# import struct for the records of the log
+import struct
+
+
+# the header is the magic bytes, the version, the seed, the rows and the cols
+HEADER = struct.Struct('<4sBqHH')
+MAGIC = b'MEMR'
+VERSION = 1
+
+# each event is the milliseconds, the kind and the coords or size
+EVENT = struct.Struct('<IBhh')
+CLICK = 0
+QUIT = 1
+RESIZE = 2
+
+
+# User-defined functions
+
+def read_log(path):
+    # returns the seed, rows and cols of a log and the list of its
+    # events as (milliseconds, kind, x, y)
+    # - path is the name of the log file
+
+    with open(path, 'rb') as log:
+        data = log.read()
+
+    magic, version, seed, rows, cols = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('%s is not a version %d input log' % (path, VERSION))
+
+    events = list(EVENT.iter_unpack(data[HEADER.size:]))
+    return seed, rows, cols, events
+
+
+# User-defined classes
+
+class InputRecorder:
+    # An object in this class writes the events of a game to a log.
+
+    def __init__(self, path, seed, rows, cols):
+        # Initialize an InputRecorder.
+        # - self is the InputRecorder to initialize
+        # - path is the name of the log file
+        # - seed is the seed the board was shuffled with
+        # - rows is the number of rows of tiles
+        # - cols is the number of columns of tiles
+
+        self.log = open(path, 'wb')
+        self.log.write(HEADER.pack(MAGIC, VERSION, seed, rows, cols))
+
+    def click(self, ms, x, y):
+        # records a click
+        # - self is the InputRecorder
+        # - ms is the milliseconds since the game started
+        # - x is the x coord of the click
+        # - y is the y coord of the click
+
+        self.log.write(EVENT.pack(ms, CLICK, x, y))
+
+    def quit(self, ms):
+        # records the close of the game
+        # - self is the InputRecorder
+        # - ms is the milliseconds since the game started
+
+        self.log.write(EVENT.pack(ms, QUIT, 0, 0))
+
+    def resize(self, ms, width, height):
+        # records a new size of the window
+        # - self is the InputRecorder
+        # - ms is the milliseconds since the game started
+        # - width is the width of the window
+        # - height is the height of the window
+
+        self.log.write(EVENT.pack(ms, RESIZE, width, height))
+
+    def close(self):
+        # writes out the rest of the log and closes it
+        # - self is the InputRecorder
+
+        self.log.close()
+
+
+class ReplayClock:
+    # An object in this class is a clock that only moves when it is
+    # told to, so a recorded game can be played faster than real time.
+
+    def __init__(self):
+        # Initialize a ReplayClock.
+        # - self is the ReplayClock to initialize
+
+        self.now = 0
+
+    def __call__(self):
+        # returns the milliseconds on the clock, like pygame.time.get_ticks
+        # - self is the ReplayClock
+
+        return self.now
@@ -0,0 +1,215 @@
+# Memory Scores - Andrew Li
+# Keeps the result of every solved game (seed, board size, seconds,
+# moves and mismatches) in a SQLite file, and reads back the best
+# results of a board size for the leaderboard.
+# Results are handed to a thread that writes them in batches, one
+# transaction for everything that arrived within interval seconds, so
+# the game only puts a tuple on a queue and never waits for the disk.
+# The file is in WAL mode, so reading the leaderboard does not wait for
+# a batch being written either. The index on (rows, cols, seconds, moves)
+# is the order of the leaderboard, so the best results of a board are
+# the first entries of the index and do not depend on how many
+# results are kept.
+#
+# python -m memory.scores --rows 4 --cols 4 --top 10
+
+# import sqlite3 for the file, threading and queue for the writer,
+# os for where the file goes, time for when a game was played and
+# argparse for the options
+import sqlite3
+import threading
+import queue
+import os
+import time
+import argparse
+
+
+# the table of results and its index, created if the file is new
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    played REAL NOT NULL,
+    seed INTEGER,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    moves INTEGER NOT NULL,
+    mismatches INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_board ON scores (rows, cols, seconds, moves);
+'''
+
+
+# User-defined functions
+
+def main():
+    # parse the options and print the leaderboard of a board size
+    parser = argparse.ArgumentParser(description='Best results of Memory')
+    parser.add_argument('--rows', type=int, default=4, help='number of rows of tiles (default: 4)')
+    parser.add_argument('--cols', type=int, default=4, help='number of columns of tiles (default: 4)')
+    parser.add_argument('--top', type=int, default=10, help='number of results shown (default: 10)')
+    parser.add_argument('--file', default=None, help='file of the results (default: %s)' % default_path())
+    args = parser.parse_args()
+
+    store = ScoreStore(args.file)
+    if not store.usable():
+        parser.exit(1, 'cannot read %s: %s\n' % (store.path, store.close()))
+    best = store.top(args.rows, args.cols, args.top)
+    store.close()
+
+    print('best of %dx%d' % (args.rows, args.cols))
+    for place, (seconds, moves, mismatches, seed, played) in enumerate(best, 1):
+        print('  %3d. %8.1f s %5d moves %5d mismatches  %s  seed %s' % (
+            place, seconds, moves, mismatches, time.strftime('%Y-%m-%d %H:%M', time.localtime(played)), seed))
+
+
+def default_path():
+    # returns where the results are kept, in the data folder of the user
+
+    folder = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(folder, 'memory', 'scores.db')
+
+
+# User-defined classes
+
+class ScoreStore:
+    # An object in this class represents the file of results, with a
+    # thread that writes the results added to it.
+
+    def __init__(self, path = None, interval = 1.0, batch = 10000):
+        # Initialize a ScoreStore and start its writer.
+        # - self is the ScoreStore to initialize
+        # - path is the SQLite file, default_path() if None
+        # - interval is how many seconds the writer gathers results for before writing them
+        # - batch is the most results written in one transaction
+
+        self.path = path or default_path()
+        self.interval = interval
+        self.batch = batch
+
+        # the results waiting to be written, None tells the writer to stop,
+        # ready is set once the table exists, and the first error of the
+        # writer is kept, after which nothing is written or read
+        self.queue = queue.Queue()
+        self.ready = threading.Event()
+        self.error = None
+        self.reader = None
+
+        self.writer = threading.Thread(target = self.write, name = 'memory-scores', daemon = True)
+        self.writer.start()
+
+    def add(self, seed, rows, cols, seconds, moves, mismatches, played = None):
+        # hands the result of a solved game to the writer, without waiting
+        # - self is the ScoreStore
+        # - seed is the seed of the board, None if it is not known
+        # - rows is the number of rows of tiles
+        # - cols is the number of columns of tiles
+        # - seconds is how long the game took
+        # - moves is the number of moves
+        # - mismatches is the number of wrong pairs
+        # - played is when the game was played, now if None
+
+        self.queue.put((time.time() if played is None else played, seed, rows, cols, seconds, moves, mismatches))
+
+    def write(self):
+        # writes the results in batches until it is told to stop, this is
+        # what the writer thread runs
+        # - self is the ScoreStore
+
+        try:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok = True)
+            connection = sqlite3.connect(self.path)
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+            connection.executescript(SCHEMA)
+        except Exception as error:
+            self.error = error
+            connection = None
+        self.ready.set()
+
+        running = True
+        while running:
+            # wait for a result, then gather the others that arrive in time
+            rows = []
+            item = self.queue.get()
+            deadline = time.monotonic() + self.interval
+            while item is not None:
+                rows.append(item)
+                if len(rows) >= self.batch:
+                    break
+                try:
+                    item = self.queue.get(timeout = max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+            running = item is not None
+
+            if rows and connection and not self.error:
+                try:
+                    with connection:
+                        connection.executemany('INSERT INTO scores (played, seed, rows, cols, seconds, moves, '
+                                               'mismatches) VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+                except Exception as error:
+                    # anything that goes wrong is kept for close, the
+                    # writer must go on so flush and close do not wait forever
+                    self.error = error
+            for i in range(len(rows) + (not running)):
+                self.queue.task_done()
+
+        if connection:
+            connection.close()
+
+    def flush(self):
+        # waits until every result added so far is written
+        # - self is the ScoreStore
+
+        self.queue.join()
+
+    def connect(self):
+        # returns the connection the results are read with, made the first
+        # time on the thread that reads
+        # - self is the ScoreStore
+
+        if self.reader is None:
+            self.ready.wait()
+            self.reader = sqlite3.connect(self.path)
+        return self.reader
+
+    def usable(self):
+        # returns if the file could be opened and nothing has gone wrong
+        # writing to it, waiting for the writer to open it
+        # - self is the ScoreStore
+
+        self.ready.wait()
+        return self.error is None
+
+    def top(self, rows, cols, count = 10):
+        # returns the best results of a board size, fastest first and
+        # fewest moves for the same time, as a list of
+        # (seconds, moves, mismatches, seed, played)
+        # - self is the ScoreStore
+        # - rows is the number of rows of tiles
+        # - cols is the number of columns of tiles
+        # - count is the number of results
+
+        return self.connect().execute(
+            'SELECT seconds, moves, mismatches, seed, played FROM scores WHERE rows = ? AND cols = ? '
+            'ORDER BY seconds, moves LIMIT ?', (rows, cols, count)).fetchall()
+
+    def close(self):
+        # writes the results that are left, stops the writer and closes the
+        # file, returns the first error the writer had, None if it had none
+        # - self is the ScoreStore
+
+        if self.writer.is_alive():
+            self.queue.put(None)
+            self.writer.join()
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+        return self.error
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,383 @@
+# Memory Server - Andrew Li
+# Hosts many games of memory (the rules of engine.py) for remote
+# players in one asyncio process. Each game is a session that is only a
+# MemoryEngine and the time it was last played, there is no pygame
+# surface, so thousands of sessions fit in a few megabytes.
+# Players connect over TCP and send one command per line, the server
+# answers each with one line starting with ok or err:
+# new ROWS COLS [SEED]  - starts a session            -> ok ID
+# flip ID INDEX         - flips a tile                -> ok FACE REMAINING, or ok - if it is face up
+# state ID              - the board of a session      -> ok STATES TIME MOVES MISMATCHES
+# end ID                - ends a session              -> ok
+# stats                 - how busy the server is      -> ok CONNECTIONS SESSIONS ROOMS COMMANDS SECONDS
+# Sessions end when the connection they were started on closes.
+# A line longer than 64 KiB is answered with err and the connection is closed.
+# Rooms are turn based games for many players (multiplayer.py),
+# the player who hosts a room is player 0 and the others join it:
+# host ROWS COLS PLAYERS [SEED] - starts a room       -> ok ROOM
+# join ROOM                     - takes the next seat -> ok PLAYER ROWS COLS PLAYERS
+# move ROOM INDEX               - flips a tile        -> ok DELTA
+# Once every seat is taken the players take turns, and the other players
+# of the room are sent each move as a line d DELTA, where DELTA is the
+# player, the tile, its face, what the flip did and whose turn is next.
+# They are also sent joined PLAYER when a player joins and gone PLAYER
+# when a player leaves, which ends the room.
+#
+# python -m memory.server --port 8765
+
+# import asyncio for the server, argparse for the options, itertools
+# for the ids of the sessions, time for the clock of the sessions and
+# random for the shuffles
+import asyncio
+import argparse
+import itertools
+import time
+import random
+
+from .engine import MemoryEngine
+from .multiplayer import TurnEngine, encode_delta
+
+
+# User-defined functions
+
+def main():
+    # parse the options and serve until stopped
+    parser = argparse.ArgumentParser(description='Serve games of Memory over TCP')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='port to listen on (default: 8765)')
+    args = parser.parse_args()
+
+    server = MemoryServer()
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+# User-defined classes
+
+class Session:
+    # An object in this class is one game played on the server.
+
+    # only these attributes, so the many sessions stay small
+    __slots__ = ['engine', 'last']
+
+    def __init__(self, engine, now):
+        # Initialize a Session.
+        # - self is the Session to initialize
+        # - engine is the MemoryEngine of the game
+        # - now is the time on the clock of the server
+
+        self.engine = engine
+        self.last = now
+
+    def tick(self, now):
+        # moves the time of the game on to now
+        # - self is the Session
+        # - now is the time on the clock of the server
+
+        self.engine.tick(now - self.last)
+        self.last = now
+
+
+class Room(Session):
+    # An object in this class is a turn based game played on the server
+    # by the players sitting in its seats.
+
+    __slots__ = ['match', 'seats']
+
+    def __init__(self, match, now):
+        # Initialize a Room.
+        # - self is the Room to initialize
+        # - match is the TurnEngine of the game
+        # - now is the time on the clock of the server
+
+        Session.__init__(self, match.engine, now)
+        self.match = match
+
+        # the writer of the connection of each player, None for a free seat
+        self.seats = [None] * match.players
+
+    def send(self, line, skip = None):
+        # sends a line to every player of the room
+        # - self is the Room
+        # - line is the line to send
+        # - skip is the player not sent the line, None to send it to all
+
+        for player, writer in enumerate(self.seats):
+            if writer and player != skip:
+                writer.write(line)
+
+
+class MemoryServer:
+    # An object in this class holds every session and answers the
+    # commands of the players.
+
+    # largest board a player can start, so one player cannot use up the memory
+    max_tiles = 64 * 64
+
+    def __init__(self, clock = time.monotonic):
+        # Initialize a MemoryServer.
+        # - self is the MemoryServer to initialize
+        # - clock is a function returning seconds, the time of the sessions
+
+        self.clock = clock
+        self.sessions = {}
+        self.rooms = {}
+        self.ids = itertools.count(1)
+        self.connections = 0
+
+        # the number of commands answered and the seconds spent on them
+        self.commands = 0
+        self.busy = 0.0
+
+    async def serve(self, host, port):
+        # listens for players until the task is cancelled
+        # - self is the MemoryServer
+        # - host is the address to listen on
+        # - port is the port to listen on
+
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def start(self, host, port):
+        # starts listening for players and returns the asyncio server
+        # - self is the MemoryServer
+        # - host is the address to listen on
+        # - port is the port to listen on, 0 for any free port
+
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self, reader, writer):
+        # answers the commands of one connection until it is closed
+        # - self is the MemoryServer
+        # - reader is the asyncio.StreamReader of the connection
+        # - writer is the asyncio.StreamWriter of the connection
+
+        # the sessions started on this connection and the seat it has
+        # in each room it is playing in
+        owned = set()
+        seated = {}
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # a line over the limit of the reader is dropped, the
+                    # rest of it would be read as a command, so the
+                    # connection is closed
+                    writer.write(b'err line too long\n')
+                    break
+                if not line:
+                    break
+                start = time.perf_counter()
+                reply = self.command(line.split(), owned, seated, writer)
+                self.busy += time.perf_counter() - start
+                self.commands += 1
+                writer.write(reply)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in owned:
+                del self.sessions[session_id]
+            for room_id, player in seated.items():
+                room = self.rooms.pop(room_id, None)
+                if room:
+                    room.send(b'gone %d\n' % player, player)
+            self.connections -= 1
+            writer.close()
+
+    def command(self, words, owned, seated = None, writer = None):
+        # runs one command and returns the line that answers it
+        # - self is the MemoryServer
+        # - words is the list of the words of the command, as bytes
+        # - owned is the set of the ids of the sessions of the connection
+        # - seated is the dict of the seat of the connection in each of its rooms
+        # - writer is the asyncio.StreamWriter other players send lines to
+
+        if not words:
+            return b'err empty command\n'
+        name = words[0]
+        try:
+            args = [int(word) for word in words[1:]]
+        except ValueError:
+            return b'err arguments must be numbers\n'
+
+        if name == b'flip' and len(args) == 2:
+            return self.flip(*args, owned)
+        if name == b'new' and len(args) in (2, 3):
+            return self.new(*args, owned = owned)
+        if name == b'state' and len(args) == 1:
+            return self.state(args[0], owned)
+        if name == b'end' and len(args) == 1:
+            return self.end(args[0], owned)
+        if name == b'move' and len(args) == 2:
+            return self.move(*args, seated)
+        if name == b'host' and len(args) in (3, 4):
+            return self.host(*args, seated = seated, writer = writer)
+        if name == b'join' and len(args) == 1:
+            return self.join(args[0], seated, writer)
+        if name == b'stats' and not args:
+            return b'ok %d %d %d %d %.6f\n' % (self.connections, len(self.sessions), len(self.rooms),
+                                                self.commands, self.busy)
+        return b'err unknown command\n'
+
+    def new(self, rows, cols, seed = None, owned = None):
+        # starts a session and returns the line with its id
+        # - self is the MemoryServer
+        # - rows is the number of rows of tiles
+        # - cols is the number of columns of tiles
+        # - seed is the seed of the shuffle of the board, None for a random one
+        # - owned is the set of the ids of the sessions of the connection
+
+        engine = self.board(rows, cols, seed)
+        if not isinstance(engine, MemoryEngine):
+            return engine
+
+        session_id = next(self.ids)
+        self.sessions[session_id] = Session(engine, self.clock())
+        owned.add(session_id)
+        return b'ok %d\n' % session_id
+
+    def board(self, rows, cols, seed):
+        # returns a new MemoryEngine, or the line with the error if the
+        # board cannot be made
+        # - self is the MemoryServer
+        # - rows is the number of rows of tiles
+        # - cols is the number of columns of tiles
+        # - seed is the seed of the shuffle of the board, None for a random one
+
+        if rows < 1 or cols < 1 or rows * cols > self.max_tiles:
+            return b'err board must have 1 to %d tiles\n' % self.max_tiles
+        try:
+            return MemoryEngine(rows, cols, rng = random.Random(seed) if seed is not None else None)
+        except ValueError as error:
+            return b'err %s\n' % str(error).encode()
+
+    def flip(self, session_id, index, owned):
+        # flips a tile of a session and returns the line with its face and
+        # the number of pairs left to match
+        # - self is the MemoryServer
+        # - session_id is the id of the session
+        # - index is the index of the tile
+        # - owned is the set of the ids of the sessions of the connection
+
+        if session_id not in owned:
+            return b'err no session %d\n' % session_id
+        session = self.sessions[session_id]
+        engine = session.engine
+        if not 0 <= index < len(engine.faces):
+            return b'err no tile %d\n' % index
+
+        session.tick(self.clock())
+        if not engine.flip(index):
+            return b'ok -\n'
+        return b'ok %d %d\n' % (engine.faces[index], engine.remaining)
+
+    def state(self, session_id, owned):
+        # returns the line with the face up tiles, time and counts of a session
+        # - self is the MemoryServer
+        # - session_id is the id of the session
+        # - owned is the set of the ids of the sessions of the connection
+
+        if session_id not in owned:
+            return b'err no session %d\n' % session_id
+        session = self.sessions[session_id]
+        session.tick(self.clock())
+        engine = session.engine
+        states = bytes(engine.state).translate(b'01'.ljust(256, b'0'))
+        return b'ok %s %.3f %d %d\n' % (states, engine.time, engine.moves, engine.mismatches)
+
+    def end(self, session_id, owned):
+        # ends a session
+        # - self is the MemoryServer
+        # - session_id is the id of the session
+        # - owned is the set of the ids of the sessions of the connection
+
+        if session_id not in owned:
+            return b'err no session %d\n' % session_id
+        owned.remove(session_id)
+        del self.sessions[session_id]
+        return b'ok\n'
+
+    def host(self, rows, cols, players, seed = None, seated = None, writer = None):
+        # starts a room with the connection in the first seat and returns
+        # the line with its id
+        # - self is the MemoryServer
+        # - rows is the number of rows of tiles
+        # - cols is the number of columns of tiles
+        # - players is the number of seats
+        # - seed is the seed of the shuffle of the board, None for a random one
+        # - seated is the dict of the seat of the connection in each of its rooms
+        # - writer is the asyncio.StreamWriter of the connection
+
+        if not 1 <= players <= 255:
+            return b'err a room has 1 to 255 players\n'
+        engine = self.board(rows, cols, seed)
+        if not isinstance(engine, MemoryEngine):
+            return engine
+
+        room_id = next(self.ids)
+        room = Room(TurnEngine(players, engine), self.clock())
+        room.seats[0] = writer
+        self.rooms[room_id] = room
+        seated[room_id] = 0
+        return b'ok %d\n' % room_id
+
+    def join(self, room_id, seated, writer):
+        # sits the connection in the next free seat of a room and returns
+        # the line with the seat and the size of the game
+        # - self is the MemoryServer
+        # - room_id is the id of the room
+        # - seated is the dict of the seat of the connection in each of its rooms
+        # - writer is the asyncio.StreamWriter of the connection
+
+        room = self.rooms.get(room_id)
+        if not room:
+            return b'err no room %d\n' % room_id
+        if room_id in seated:
+            return b'err already in room %d\n' % room_id
+        if None not in room.seats:
+            return b'err room %d is full\n' % room_id
+
+        player = room.seats.index(None)
+        room.seats[player] = writer
+        seated[room_id] = player
+        room.send(b'joined %d\n' % player, player)
+        engine = room.engine
+        return b'ok %d %d %d %d\n' % (player, engine.rows, engine.cols, room.match.players)
+
+    def move(self, room_id, index, seated):
+        # flips a tile for the player of the connection, sends the delta
+        # to the other players and returns the line with the delta
+        # - self is the MemoryServer
+        # - room_id is the id of the room
+        # - index is the index of the tile
+        # - seated is the dict of the seat of the connection in each of its rooms
+
+        room = self.rooms.get(room_id)
+        if not room or room_id not in seated:
+            return b'err not in room %d\n' % room_id
+        if None in room.seats:
+            return b'err waiting for players\n'
+        if not 0 <= index < len(room.engine.faces):
+            return b'err no tile %d\n' % index
+
+        player = seated[room_id]
+        if player != room.match.turn:
+            return b'err not your turn\n'
+        room.tick(self.clock())
+        delta = room.match.flip(player, index)
+        if not delta:
+            return b'err tile %d is face up\n' % index
+
+        line = encode_delta(delta)
+        room.send(b'd %s\n' % line, player)
+        return b'ok %s\n' % line
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+# Memory Snapshot - Andrew Li
+# Saves a game of v3.py that is not finished so it can be resumed later,
+# and writes a snapshot after every move so closing the window or a
+# crash loses at most the move being made.
+# A snapshot is a header of the counts, the timing and the turn, then
+# the face of every tile (the shuffled order of the pair numbers), a
+# bitset of the tiles that are face up, a bitset of the tiles the
+# players have seen and the pairs of each player. A 4x4 board is about
+# a hundred bytes, and reading one is a few copies of bytes into the
+# arrays of a MemoryEngine, whatever the size of the board.
+# The file is written on a thread, to a new file that is then renamed
+# over the old one, so a half written snapshot is never read.
+
+# import struct for the header, sys for the byte order, array for the
+# faces, os for the file, threading and queue for the writer
+import struct
+import sys
+import os
+import threading
+import queue
+from array import array
+
+from .engine import MemoryEngine
+
+
+# the header is the magic bytes, the version, what is set (FLAGS),
+# the rows, the cols, the seed, the reveal delay, the seconds played,
+# the time a wrong pair is hidden at, the moves, matches and mismatches,
+# the first tile of a move, the wrong pair, the players, the bots and
+# whose turn it is
+HEADER = struct.Struct('<4sBBHHqdddIIIHHHBBB')
+MAGIC = b'MEMS'
+VERSION = 1
+
+# bits of the flags of the header
+HAS_SEED = 1
+HAS_FIRST = 2
+HAS_PENDING = 4
+
+# a bitset is written as the digits of one big number, tile 0 is the lowest bit
+TO_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+FROM_DIGITS = bytes.maketrans(b'01', b'\x00\x01')
+
+# what is put on the queue of an Autosaver to stop its writer
+STOP = object()
+
+
+# User-defined functions
+
+def default_path():
+    # returns where the game is saved, in the state folder of the user
+
+    folder = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(folder, 'memory', 'snapshot.bin')
+
+
+def read_snapshot(path):
+    # returns the Snapshot saved in a file
+    # - path is the name of the file
+
+    with open(path, 'rb') as saved:
+        return Snapshot.decode(saved.read())
+
+
+def pack_bits(flags):
+    # returns the bytes of a bitset of flags that are 0 or 1
+    # - flags is the bytearray of the flags
+
+    if not flags:
+        return b''
+    return int(flags.translate(TO_DIGITS)[::-1], 2).to_bytes((len(flags) + 7) // 8, 'little')
+
+
+def unpack_bits(data, count):
+    # returns the bytearray of the flags of a bitset
+    # - data is the bytes of the bitset
+    # - count is the number of flags
+
+    if not count:
+        return bytearray()
+    digits = format(int.from_bytes(data, 'little'), '0%db' % count)
+    if len(digits) != count:
+        raise ValueError('a bitset of %d flags has more bits set' % count)
+    return bytearray(digits[::-1].encode('ascii').translate(FROM_DIGITS))
+
+
+# User-defined classes
+
+class Snapshot:
+    # An object in this class is everything needed to go on with a game:
+    # the MemoryEngine, what the players have seen and the turns.
+
+    __slots__ = ['engine', 'seen', 'seed', 'players', 'bots', 'turn', 'scores']
+
+    def __init__(self, engine, seen, seed = None, players = 1, bots = 0, turn = 0, scores = None):
+        # Initialize a Snapshot.
+        # - self is the Snapshot to initialize
+        # - engine is the MemoryEngine of the game
+        # - seen is for every tile if the players have seen its face
+        # - seed is the seed the board was shuffled with, None if it is not known
+        # - players is the number of players taking turns
+        # - bots is how many of the players, the last ones, are bots
+        # - turn is the player whose turn it is
+        # - scores is the array of the pairs of each player, none yet if None
+
+        self.engine = engine
+        self.seen = seen
+        self.seed = seed
+        self.players = players
+        self.bots = bots
+        self.turn = turn
+        self.scores = scores if scores is not None else array('H', [0]) * players
+
+    def encode(self):
+        # returns the bytes of the snapshot
+        # - self is the Snapshot
+
+        engine = self.engine
+        flags = 0
+        if self.seed is not None:
+            flags |= HAS_SEED
+        if engine.first is not None:
+            flags |= HAS_FIRST
+        if engine.pending is not None:
+            flags |= HAS_PENDING
+        first = engine.first or 0
+        pending = engine.pending or (0, 0)
+        hide_time = engine.hide_time if engine.hide_time is not None else 0.0
+
+        header = HEADER.pack(MAGIC, VERSION, flags, engine.rows, engine.cols, self.seed or 0,
+                             engine.reveal_delay, engine.time, hide_time, engine.moves, engine.matches,
+                             engine.mismatches, first, pending[0], pending[1], self.players, self.bots, self.turn)
+
+        # the arrays are written little endian whatever the computer is
+        faces = engine.faces
+        scores = self.scores
+        if sys.byteorder == 'big':
+            faces = array('H', faces)
+            faces.byteswap()
+            scores = array('H', scores)
+            scores.byteswap()
+        return b''.join([header, faces.tobytes(), pack_bits(engine.state), pack_bits(self.seen), scores.tobytes()])
+
+    @classmethod
+    def decode(cls, data):
+        # returns the Snapshot of some bytes
+        # - cls is the Snapshot class
+        # - data is the bytes made by encode
+
+        if len(data) < HEADER.size:
+            raise ValueError('a snapshot is at least %d bytes' % HEADER.size)
+        (magic, version, flags, rows, cols, seed, reveal_delay, time, hide_time, moves, matches, mismatches,
+         first, pending_first, pending_second, players, bots, turn) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('not a version %d snapshot' % VERSION)
+
+        cells = rows * cols
+        bitset = (cells + 7) // 8
+        if len(data) != HEADER.size + cells * 2 + bitset * 2 + players * 2:
+            raise ValueError('a snapshot of a %dx%d board for %d players has the wrong size' % (rows, cols, players))
+
+        start = HEADER.size
+        faces = array('H')
+        faces.frombytes(data[start:start + cells * 2])
+        start += cells * 2
+        state = unpack_bits(data[start:start + bitset], cells)
+        start += bitset
+        seen = unpack_bits(data[start:start + bitset], cells)
+        start += bitset
+        scores = array('H')
+        scores.frombytes(data[start:])
+        if sys.byteorder == 'big':
+            faces.byteswap()
+            scores.byteswap()
+
+        # the engine is made from the faces and given the rest of the state
+        engine = MemoryEngine(rows, cols, reveal_delay, faces = faces)
+        engine.state = state
+        engine.remaining = cells // 2 - matches
+        engine.first = first if flags & HAS_FIRST else None
+        if flags & HAS_PENDING:
+            engine.pending = (pending_first, pending_second)
+            engine.hide_time = hide_time
+        engine.time = time
+        engine.moves = moves
+        engine.matches = matches
+        engine.mismatches = mismatches
+        return cls(engine, seen, seed if flags & HAS_SEED else None, players, bots, turn, scores)
+
+
+class Autosaver:
+    # An object in this class writes snapshots to a file on a thread,
+    # so saving after every move never waits for the disk. Only the
+    # newest snapshot waiting is written, the ones before it are skipped.
+
+    def __init__(self, path = None):
+        # Initialize an Autosaver and start its writer.
+        # - self is the Autosaver to initialize
+        # - path is the file the game is saved to, default_path() if None
+
+        self.path = path or default_path()
+
+        # the bytes of a snapshot to write, or None to remove the file,
+        # or STOP, and the first error of the writer is kept
+        self.queue = queue.Queue()
+        self.error = None
+        self.writer = threading.Thread(target = self.write, name = 'memory-autosave', daemon = True)
+        self.writer.start()
+
+    def save(self, snapshot):
+        # hands a snapshot to the writer, without waiting
+        # - self is the Autosaver
+        # - snapshot is the Snapshot to save
+
+        self.queue.put(snapshot.encode())
+
+    def remove(self):
+        # removes the saved game, once it is solved, without waiting
+        # - self is the Autosaver
+
+        self.queue.put(None)
+
+    def write(self):
+        # writes the newest snapshot waiting, this is what the writer thread runs
+        # - self is the Autosaver
+
+        folder = os.path.dirname(self.path)
+        partial = self.path + '.tmp'
+        stop = False
+        while not stop:
+            # skip to the newest item, the last one is still written on a stop
+            item = self.queue.get()
+            stop = item is STOP
+            while not stop and not self.queue.empty():
+                newer = self.queue.get()
+                stop = newer is STOP
+                if not stop:
+                    item = newer
+            if item is STOP:
+                continue
+
+            try:
+                if item is None:
+                    if os.path.exists(self.path):
+                        os.remove(self.path)
+                else:
+                    if folder:
+                        os.makedirs(folder, exist_ok = True)
+                    with open(partial, 'wb') as saved:
+                        saved.write(item)
+                    os.replace(partial, self.path)
+            except Exception as error:
+                self.error = self.error or error
+
+    def close(self):
+        # writes the snapshot that is left and stops the writer, returns the
+        # first error the writer had, None if it had none
+        # - self is the Autosaver
+
+        if self.writer.is_alive():
+            self.queue.put(STOP)
+            self.writer.join()
+        return self.error
@@ -0,0 +1,240 @@
+# Memory Solver - Andrew Li
+# Works out the best next flip for a player who remembers every tile
+# they have seen, and how many moves they can expect to take.
+# A board is summed up by the number of tiles never seen (unseen) and
+# the number of faces seen once and not matched (singletons), the
+# unseen tiles are the partners of the singletons and the pairs of the
+# faces not seen yet. A pair whose two tiles are known is always
+# matched straight away, so it is not part of the state.
+# On each move the player flips an unseen tile. If its partner is a
+# known singleton it is matched. Otherwise the player either flips
+# another unseen tile, hoping for a match but showing a new face, or
+# flips a known singleton again so nothing new is shown. The expected
+# moves of every (unseen, singletons) state are found once, smallest
+# boards first, and kept, so each answer after that is a lookup. What a
+# player knows is kept in a Knowledge that is told about each flip and
+# match, so a hint does not look at the whole board.
+#
+# python -m memory.solver --rows 4 --cols 4
+
+# import argparse for the options and array for the tables
+import argparse
+from array import array
+
+
+# User-defined functions
+
+def main():
+    # parse the options and print the expected moves of a new board
+    parser = argparse.ArgumentParser(description='Expected moves of the best player of Memory')
+    parser.add_argument('--rows', type=int, default=4, help='number of rows of tiles (default: 4)')
+    parser.add_argument('--cols', type=int, default=4, help='number of columns of tiles (default: 4)')
+    args = parser.parse_args()
+
+    cells = args.rows * args.cols
+    if cells % 2:
+        parser.error('a board of %dx%d has an odd number of tiles' % (args.rows, args.cols))
+    print('%dx%d: %.3f expected moves for the best player' % (args.rows, args.cols, SOLVER.expected(cells, 0)))
+
+
+# User-defined classes
+
+class Solver:
+    # An object in this class holds the expected moves and the best
+    # second flip of every state it has been asked about so far.
+
+    def __init__(self):
+        # Initialize a Solver.
+        # - self is the Solver to initialize
+
+        # for every number of unseen tiles, the expected moves and if a
+        # known singleton is the best second flip, for each number of singletons
+        self.moves = []
+        self.safe = []
+
+    def extend(self, unseen):
+        # fills the tables up to a number of unseen tiles
+        # - self is the Solver
+        # - unseen is the largest number of unseen tiles needed
+
+        for n in range(len(self.moves), unseen + 1):
+            row = array('d', [0.0]) * (n + 1)
+            safe = bytearray(n + 1)
+
+            # the unseen tiles are the k partners and the pairs of new faces,
+            # so k has the same parity as n
+            for k in range(n % 2, n + 1, 2):
+                if n == 0:
+                    continue
+
+                # the first tile is a partner of a singleton and is matched,
+                # or else it has a new face and the second tile is chosen
+                expected = 1.0
+                if k:
+                    expected += k / n * self.moves[n - 1][k - 1]
+                if n > k:
+                    second, safe[k] = self.second(n, k)
+                    expected += (n - k) / n * second
+                row[k] = expected
+
+            self.moves.append(row)
+            self.safe.append(safe)
+
+    def second(self, n, k):
+        # returns the expected moves after the second flip of a move whose
+        # first tile showed a new face, and if flipping a known singleton
+        # is better than flipping an unseen tile, the tables must be
+        # filled below n
+        # - self is the Solver
+        # - n is the number of unseen tiles before the first flip
+        # - k is the number of singletons before the first flip
+
+        moves = self.moves
+        new = n - k
+        rest = n - 1
+
+        # an unseen tile matches the first, or is the partner of a singleton,
+        # which makes a known pair matched on the next move, or is a new face
+        guess = (1 + k) / rest * moves[n - 2][k] + k / rest
+        if new > 2:
+            guess += (new - 2) / rest * moves[n - 2][k + 2]
+
+        # a known singleton shows nothing new, the first tile is one more singleton
+        if k and moves[n - 1][k + 1] < guess:
+            return moves[n - 1][k + 1], 1
+        return guess, 0
+
+    def expected(self, unseen, singletons):
+        # returns the expected number of moves to match every pair of a state
+        # - self is the Solver
+        # - unseen is the number of tiles never seen
+        # - singletons is the number of faces seen once and not matched
+
+        if unseen >= len(self.moves):
+            self.extend(unseen)
+        return self.moves[unseen][singletons]
+
+    def safe_second(self, unseen, singletons):
+        # returns if flipping a known singleton is better than flipping an
+        # unseen tile after the first tile showed a new face
+        # - self is the Solver
+        # - unseen is the number of tiles never seen, before the first flip
+        # - singletons is the number of faces seen once and not matched, before the first flip
+
+        if unseen >= len(self.safe):
+            self.extend(unseen)
+        return bool(self.safe[unseen][singletons])
+
+    def table(self, unseen):
+        # returns the table of safe_second for every state up to a number
+        # of unseen tiles, as a list of rows, for players that look up
+        # many states at once
+        # - self is the Solver
+        # - unseen is the largest number of unseen tiles needed
+
+        self.extend(unseen)
+        return self.safe[:unseen + 1]
+
+    def hint(self, knowledge, first = None):
+        # returns the tile the best player flips next and the expected
+        # number of moves left, or (None, 0.0) if the board is solved
+        # - self is the Solver
+        # - knowledge is the Knowledge of the player
+        # - first is the index of the first tile of the move, None between moves
+
+        known = knowledge.known
+        unseen = knowledge.unseen
+        pairs = len(knowledge.pairs)
+        singletons = len(knowledge.singletons)
+
+        if first is None:
+            if not pairs and not unseen:
+                return None, 0.0
+            expected = pairs + self.expected(len(unseen), singletons)
+            if pairs:
+                return known[next(iter(knowledge.pairs))][0], expected
+            return next(iter(unseen)), expected
+
+        # the second tile of a move: the partner of the first if it is known
+        face = knowledge.faces[first]
+        tiles = known[face]
+        if len(tiles) == 2:
+            partner = tiles[0] if tiles[1] == first else tiles[1]
+            return partner, pairs + self.expected(len(unseen), singletons)
+
+        # the first tile showed a new face, so its partner is unseen
+        n = len(unseen) + 1
+        k = singletons - 1
+        if n >= len(self.moves):
+            self.extend(n)
+        second, safe = self.second(n, k)
+        if safe:
+            other = next(single for single in knowledge.singletons if single != face)
+            return known[other][0], 1 + pairs + second
+        return next(iter(unseen)), 1 + pairs + second
+
+
+class Knowledge:
+    # An object in this class is what a player who remembers every tile
+    # knows of a board: the tiles never seen, and where the faces that
+    # are seen and not matched yet are, kept up to date one flip at a time.
+
+    __slots__ = ['faces', 'unseen', 'known', 'pairs', 'singletons']
+
+    def __init__(self, faces, seen = None, state = None, first = None, pending = None):
+        # Initialize a Knowledge, of a new board or of a game going on.
+        # - self is the Knowledge to initialize
+        # - faces is the face of every tile
+        # - seen is for every tile if the player has seen its face, none if None
+        # - state is the state of every tile (0 = face down, 1 = face up), all face down if None
+        # - first is the index of the first tile of the move, None between moves
+        # - pending is the wrong pair still shown, which counts as face down
+
+        # the faces seen once and twice, with the tiles of each face
+        self.faces = faces
+        self.unseen = set()
+        self.known = {}
+        self.pairs = set()
+        self.singletons = set()
+        for index in range(len(faces)):
+            matched = state and state[index] and index != first and not (pending and index in pending)
+            if matched:
+                continue
+            if seen and seen[index]:
+                self.saw(index)
+            else:
+                self.unseen.add(index)
+
+    def saw(self, index):
+        # remembers the face of a tile that was flipped
+        # - self is the Knowledge
+        # - index is the index of the tile
+
+        self.unseen.discard(index)
+        face = self.faces[index]
+        tiles = self.known.setdefault(face, [])
+        if index in tiles:
+            return
+        tiles.append(index)
+        if len(tiles) == 2:
+            self.singletons.discard(face)
+            self.pairs.add(face)
+        else:
+            self.singletons.add(face)
+
+    def matched(self, face):
+        # forgets a face once its pair is matched
+        # - self is the Knowledge
+        # - face is the face of the pair
+
+        self.known.pop(face, None)
+        self.pairs.discard(face)
+        self.singletons.discard(face)
+
+
+# the tables are shared by everyone who asks, so they are only filled once
+SOLVER = Solver()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,392 @@
+# Memory Tournament - Andrew Li
+# Plays many full games of memory (the rules of engine.py) with scripted
+# players on every core, to compare players, board sizes and reveal delays.
+# The games of each setup are cut into shards of seeds, a pool of
+# processes plays the shards, and every shard sends back the moves,
+# mismatches and simulated seconds of each of its games. The results are
+# added to running statistics as the shards come in, so nothing waits
+# for the slowest shard and the memory used does not grow with the games.
+# Every setup plays the same seeds, so players are compared on the same
+# boards. The players:
+# random  - flips face down tiles at random
+# perfect - remembers every tile it has seen and flips what solver.py says
+# limited - only remembers the tiles it saw in its last few flips
+#
+# python -m memory.tournament --games 100000 --players random,perfect --sizes 4x4,6x6 --delays 0.5,1.0
+
+# import argparse for the options, multiprocessing for the pool of
+# processes, os for the number of cores, time to report how fast the
+# games were played, random for the boards and players, math for the
+# statistics and array and collections for keeping the results small
+import argparse
+import multiprocessing
+import os
+import time
+import random
+import math
+from array import array
+from collections import deque
+
+from .engine import MemoryEngine
+from .solver import SOLVER, Knowledge
+
+
+# names of the players in the order they are listed
+PLAYERS = ['random', 'perfect', 'limited']
+
+
+# User-defined functions
+
+def main():
+    # parse the options, play the tournament and print the results
+    parser = argparse.ArgumentParser(description='Play many games of Memory with scripted players on every core')
+    parser.add_argument('--games', type=int, default=10000, help='games of each setup (default: 10000)')
+    parser.add_argument('--players', type=names, default=['perfect'],
+                        help='comma separated players out of %s (default: perfect)' % ', '.join(PLAYERS))
+    parser.add_argument('--sizes', type=sizes, default=[(4, 4)],
+                        help='comma separated boards as ROWSxCOLS (default: 4x4)')
+    parser.add_argument('--delays', type=delays, default=[1.0],
+                        help='comma separated seconds a wrong pair stays shown (default: 1.0)')
+    parser.add_argument('--flip-time', type=float, default=0.5,
+                        help='seconds a player takes to flip a tile (default: 0.5)')
+    parser.add_argument('--memory', type=int, default=8,
+                        help='flips the limited player remembers (default: 8)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='processes playing games (default: one per core)')
+    parser.add_argument('--shard', type=int, default=500, help='games sent to a process at once (default: 500)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game (default: 0)')
+    parser.add_argument('--out', default=None, help='file to write a CSV line per game to')
+    args = parser.parse_args()
+
+    if args.games < 1 or args.workers < 1 or args.shard < 1:
+        parser.error('--games, --workers and --shard must be at least 1')
+    if args.memory < 0:
+        parser.error('--memory must be at least 0')
+
+    setups = [(player, rows, cols, delay) for player in args.players
+              for rows, cols in args.sizes for delay in args.delays]
+    out = open(args.out, 'w') if args.out else None
+    if out:
+        out.write('player,rows,cols,delay,seed,moves,mismatches,seconds\n')
+
+    start = time.perf_counter()
+    results = run(setups, args.games, args.seed, args.flip_time, args.memory, args.workers, args.shard, out)
+    seconds = time.perf_counter() - start
+    if out:
+        out.close()
+
+    games = args.games * len(setups)
+    print('%d games of %d setups on %d processes in %.2f seconds' % (games, len(setups), args.workers, seconds))
+    print('  games per second: %.0f' % (games / seconds))
+    for setup, stats in zip(setups, results):
+        print('%s %dx%d, %.2f s delay' % setup)
+        for name, running in zip(['moves', 'mismatches', 'seconds'], stats):
+            print('  %-10s %s' % (name, running))
+
+
+def names(text):
+    # returns the list of players in a comma separated option
+    # - text is the option
+
+    players = text.split(',')
+    for player in players:
+        if player not in PLAYERS:
+            raise argparse.ArgumentTypeError('unknown player %r' % player)
+    return players
+
+
+def sizes(text):
+    # returns the list of (rows, cols) of the boards in a comma separated option
+    # - text is the option
+
+    boards = []
+    for size in text.split(','):
+        try:
+            rows, cols = [int(part) for part in size.lower().split('x')]
+        except ValueError:
+            raise argparse.ArgumentTypeError('a board is ROWSxCOLS, not %r' % size)
+        if rows < 1 or cols < 1 or rows * cols % 2:
+            raise argparse.ArgumentTypeError('a board of %dx%d has an odd number of tiles' % (rows, cols))
+        boards.append((rows, cols))
+    return boards
+
+
+def delays(text):
+    # returns the list of reveal delays in a comma separated option
+    # - text is the option
+
+    try:
+        return [float(delay) for delay in text.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError('a delay is a number of seconds, not %r' % text)
+
+
+def run(setups, games, seed = 0, flip_time = 0.5, memory = 8, workers = None, shard = 500, out = None):
+    # plays the games of every setup on a pool of processes and returns
+    # the RunningStats of the moves, mismatches and seconds of each setup
+    # - setups is the list of (player, rows, cols, reveal_delay)
+    # - games is the number of games of each setup
+    # - seed is the seed of the first game of each setup
+    # - flip_time is how many seconds a player takes to flip a tile
+    # - memory is the number of flips the limited player remembers
+    # - workers is the number of processes, one per core if None
+    # - shard is the number of games sent to a process at once
+    # - out is the file a CSV line per game is written to, None for no file
+
+    shards = [(number, player, rows, cols, delay, flip_time, memory, first, min(shard, seed + games - first))
+              for number, (player, rows, cols, delay) in enumerate(setups)
+              for first in range(seed, seed + games, shard)]
+    results = [(RunningStats(), RunningStats(), RunningStats()) for setup in setups]
+
+    # one process plays the shards here, without the cost of starting a pool
+    if workers == 1:
+        finished = map(play_shard, shards)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        finished = pool.imap_unordered(play_shard, shards)
+
+    try:
+        for number, first, moves, mismatches, seconds in finished:
+            stats = results[number]
+            stats[0].add_all(moves)
+            stats[1].add_all(mismatches)
+            stats[2].add_all(seconds)
+            if out:
+                setup = ','.join(str(value) for value in setups[number])
+                out.writelines('%s,%d,%d,%d,%.3f\n' % (setup, first + game, moves[game], mismatches[game],
+                                                       seconds[game]) for game in range(len(moves)))
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+    return results
+
+
+def play_shard(shard):
+    # plays the games of a shard, this is what the processes of the pool run,
+    # returns the number of the setup, the first seed and arrays of the
+    # moves, mismatches and seconds of each game
+    # - shard is (setup number, player, rows, cols, reveal_delay, flip_time,
+    #   memory, first seed, games)
+
+    number, player, rows, cols, delay, flip_time, memory, first, games = shard
+    SOLVER.extend(rows * cols)
+    moves = array('I')
+    mismatches = array('I')
+    seconds = array('d')
+    for seed in range(first, first + games):
+        engine = play_game(player, rows, cols, delay, flip_time, seed, memory)
+        moves.append(engine.moves)
+        mismatches.append(engine.mismatches)
+        seconds.append(engine.time)
+    return number, first, moves, mismatches, seconds
+
+
+def play_game(player, rows, cols, reveal_delay = 1.0, flip_time = 0.5, seed = 0, memory = 8):
+    # plays one game until it is solved and returns its MemoryEngine
+    # - player is the name of the player, one of PLAYERS
+    # - rows is the number of rows of tiles
+    # - cols is the number of columns of tiles
+    # - reveal_delay is how many seconds a wrong pair stays shown
+    # - flip_time is how many seconds the player takes to flip a tile
+    # - seed is the seed of the board, the player uses a seed made from it
+    # - memory is the number of flips the limited player remembers
+
+    engine = MemoryEngine(rows, cols, reveal_delay, random.Random(seed * 2))
+    rng = random.Random(seed * 2 + 1)
+    if player == 'random':
+        player = RandomPlayer(rng)
+    elif player == 'perfect':
+        player = PerfectPlayer(rng)
+    elif player == 'limited':
+        player = LimitedPlayer(rng, memory)
+    else:
+        raise ValueError('unknown player %r' % player)
+
+    # the player looks at a wrong pair until it is flipped back
+    while not engine.is_solved():
+        engine.tick(flip_time)
+        index = player.choose(engine)
+        engine.flip(index)
+        player.saw(index)
+        if engine.pending is not None:
+            engine.tick(engine.hide_time - engine.time)
+    return engine
+
+
+# User-defined classes
+
+class RunningStats:
+    # An object in this class represents the count, mean, spread and
+    # range of numbers added one at a time, without keeping the numbers.
+
+    __slots__ = ['count', 'mean', 'squares', 'low', 'high']
+
+    def __init__(self):
+        # Initialize a RunningStats.
+        # - self is the RunningStats to initialize
+
+        # squares is the sum of the squared distances from the mean
+        self.count = 0
+        self.mean = 0.0
+        self.squares = 0.0
+        self.low = math.inf
+        self.high = -math.inf
+
+    def add(self, value):
+        # adds one number, moving the mean towards it (Welford's method)
+        # - self is the RunningStats
+        # - value is the number
+
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.squares += delta * (value - self.mean)
+        if value < self.low:
+            self.low = value
+        if value > self.high:
+            self.high = value
+
+    def add_all(self, values):
+        # adds every number of a sequence
+        # - self is the RunningStats
+        # - values is the sequence of numbers
+
+        for value in values:
+            self.add(value)
+
+    def deviation(self):
+        # returns the standard deviation of the numbers
+        # - self is the RunningStats
+
+        return math.sqrt(self.squares / (self.count - 1)) if self.count > 1 else 0.0
+
+    def __str__(self):
+        # returns the statistics as one line
+        # - self is the RunningStats
+
+        return 'mean %.3f, sd %.3f, min %g, max %g (%d games)' % (
+            self.mean, self.deviation(), self.low, self.high, self.count)
+
+
+class RandomPlayer:
+    # An object in this class represents a player that remembers nothing.
+
+    def __init__(self, rng):
+        # Initialize a RandomPlayer.
+        # - self is the RandomPlayer to initialize
+        # - rng is the random.Random the tiles are picked with
+
+        self.rng = rng
+
+    def choose(self, engine):
+        # returns a random face down tile
+        # - self is the RandomPlayer
+        # - engine is the MemoryEngine of the game
+
+        state = engine.state
+        return self.rng.choice([index for index in range(len(state)) if not state[index]])
+
+    def saw(self, index):
+        # forgets the tile that was flipped
+        # - self is the RandomPlayer
+        # - index is the index of the tile
+
+        pass
+
+
+class PerfectPlayer(RandomPlayer):
+    # An object in this class represents a player that remembers every
+    # tile it has seen and plays the best flip of solver.py.
+
+    def __init__(self, rng):
+        # Initialize a PerfectPlayer.
+        # - self is the PerfectPlayer to initialize
+        # - rng is the random.Random, kept so every player is made the same way
+
+        RandomPlayer.__init__(self, rng)
+        self.knowledge = None
+        self.engine = None
+
+    def choose(self, engine):
+        # returns the tile the solver says to flip
+        # - self is the PerfectPlayer
+        # - engine is the MemoryEngine of the game
+
+        if self.knowledge is None:
+            self.knowledge = Knowledge(engine.faces)
+            self.engine = engine
+        return SOLVER.hint(self.knowledge, engine.first)[0]
+
+    def saw(self, index):
+        # remembers the tile that was flipped, and forgets its face once
+        # its pair is matched
+        # - self is the PerfectPlayer
+        # - index is the index of the tile
+
+        engine = self.engine
+        self.knowledge.saw(index)
+        if engine.first is None and engine.pending is None:
+            self.knowledge.matched(engine.faces[index])
+
+
+class LimitedPlayer(RandomPlayer):
+    # An object in this class represents a player that only remembers
+    # the tiles of its last few flips. A known pair is flipped straight
+    # away, otherwise a new tile and then its partner if it is known or
+    # else another new tile, like the limited player of batch.py.
+
+    def __init__(self, rng, memory):
+        # Initialize a LimitedPlayer.
+        # - self is the LimitedPlayer to initialize
+        # - rng is the random.Random the new tiles are picked with
+        # - memory is the number of flips it remembers
+
+        RandomPlayer.__init__(self, rng)
+        self.memory = memory
+        self.recent = deque(maxlen = memory + 1)
+
+    def choose(self, engine):
+        # returns the next tile to flip
+        # - self is the LimitedPlayer
+        # - engine is the MemoryEngine of the game
+
+        faces = engine.faces
+        state = engine.state
+        first = engine.first
+
+        # where the remembered faces that are face down are, the first
+        # tile of a move does not push a tile out until the move is done
+        recent = list(self.recent)
+        if first is None:
+            recent = recent[max(len(recent) - self.memory, 0):]
+        known = {}
+        for index in recent:
+            if not state[index] and index != first:
+                indexes = known.setdefault(faces[index], [])
+                if index not in indexes:
+                    indexes.append(index)
+
+        if first is None:
+            pair = next((indexes for indexes in known.values() if len(indexes) == 2), None)
+            if pair:
+                return pair[0]
+        elif faces[first] in known:
+            return known[faces[first]][0]
+
+        remembered = set(index for indexes in known.values() for index in indexes)
+        choices = [index for index in range(len(state)) if not state[index] and index not in remembered]
+        return self.rng.choice(choices or list(remembered))
+
+    def saw(self, index):
+        # remembers the tile that was flipped, the oldest is forgotten
+        # once there are more than memory
+        # - self is the LimitedPlayer
+        # - index is the index of the tile
+
+        self.recent.append(index)
+
+
+if __name__ == '__main__':
+    main()
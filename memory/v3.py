@@ -0,0 +1,1402 @@
+# Memory Version 3 - Andrew Li
+# This program is a matching game that consists of a 4x4 matrix
+# (or any other number of rows and columns).
+# You try to match the tiles of two chooses tiles by 
+# fliping the tiles (future versions) via clicking on the tiles
+# Version 3 - first version plus scoring
+# event handling of clicks and having the game end when
+# all tiles are flipped
+
+# import pygame and os for file path, the options of the command
+# line, random for the seed, time for the start up time, a thread pool and
+# queue for loading the faces, io, hashlib and mmap for the face cache
+# on disk, an ordered dict for the faces kept in memory, the engine
+# that has the rules of the game, the turns of many players, the
+# solver for hints and bots, the flip animations, the frame profiler,
+# the input recorder and the snapshots of a game
+import pygame
+import os
+import random
+import time
+import queue
+import io
+import hashlib
+import mmap
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .cli import parse_options
+from .engine import MemoryEngine
+from .multiplayer import TurnEngine
+from .solver import SOLVER, Knowledge
+from .animation import FlipAnimator
+from .profile import FrameProfiler
+from .replay import InputRecorder, ReplayClock, read_log, CLICK, QUIT
+from .snapshot import Snapshot, Autosaver, read_snapshot, default_path
+
+
+# User-defined functions
+
+def main(argv = None):
+    # read the options from the command line and play the game
+    # - argv is the list of the options, the command line if None
+
+    start(parse_options(argv))
+
+
+def start(args):
+    # play the game with the options of the command line
+    # - args is the options parsed by parse_options
+
+    profiler = FrameProfiler() if args.profile or args.trace else None
+
+    # initialize all pygame modules (some need initialization)
+    pygame.init()
+    # create a pygame display window, the board is fitted to its size
+    pygame.display.set_mode((520, 415), pygame.RESIZABLE)
+    # set the title of the display window
+    pygame.display.set_caption('Memory')   
+    # get the display surface
+    w_surface = pygame.display.get_surface() 
+    if args.replay:
+        # a replay has the board and the clicks of its log and its own clock
+        seed, rows, cols, events = read_log(args.replay)
+        clock = ReplayClock()
+        game = Game(w_surface, rows, cols, profiler, seed, clock)
+        replay(game, events, clock, args.speed)
+        print('replayed %s: solved %s, %d moves, %d mismatches, %.1f seconds' % (
+            args.replay, game.engine.is_solved(), game.engine.moves, game.engine.mismatches, game.engine.time))
+    else:
+        # a resumed game has its board, players and seed in its snapshot
+        saved = None
+        rows, cols, players, bots = args.rows, args.cols, args.players, args.bots
+        snapshot_path = args.snapshot or default_path()
+        if args.resume:
+            try:
+                saved = read_snapshot(snapshot_path)
+            except (OSError, ValueError) as error:
+                print('no saved game to resume in %s (%s), a new game is started' % (snapshot_path, error))
+        if saved:
+            rows, cols, players, bots = saved.engine.rows, saved.engine.cols, saved.players, saved.bots
+        # a recorded or kept game needs a seed to be shuffled the same way again
+        seed = saved.seed if saved else args.seed
+        if seed is None and not saved:
+            seed = random.randrange(2**63)
+        recorder = InputRecorder(args.record, seed, rows, cols) if args.record else None
+        # sqlite3 is only loaded for a game that keeps its score
+        store = None
+        if not args.no_scores and players == 1 and not bots:
+            from .scores import ScoreStore
+            store = ScoreStore(args.scores)
+        # a new game is not saved over a game kept for --resume
+        saver = None
+        if not args.no_save:
+            if saved or args.resume or args.overwrite_save or not os.path.exists(snapshot_path):
+                saver = Autosaver(snapshot_path)
+            else:
+                print('a saved game is kept in %s, this game is not saved, '
+                      'use --resume to go on with it or --overwrite-save to save over it' % snapshot_path)
+        # create a game object
+        game = Game(w_surface, rows, cols, profiler, seed, None, recorder, players, bots, store, saved, saver)
+        # start the main game loop by calling the play method on the game object
+        game.play() 
+        if recorder:
+            recorder.close()
+        if store:
+            error = store.close()
+            if error:
+                print('the result was not kept in %s: %s' % (store.path, error))
+        # a game closed in the middle of a move is saved as it is
+        if saver:
+            game.autosave()
+            error = saver.close()
+            if error:
+                print('the game was not saved in %s: %s' % (saver.path, error))
+    # report how long the window took to show the board
+    if profiler:
+        print('time to first frame: %.1f ms' % (game.first_frame_time * 1000))
+    # write out the frame times
+    if args.trace:
+        profiler.dump(args.trace)
+    # quit pygame and clean up the pygame window
+    pygame.quit() 
+
+
+def replay(game, events, clock, speed = 0):
+    # plays recorded events on a game, a frame at a time
+    # - game is the Game to play, made with clock as its clock
+    # - events is the list of (milliseconds, kind, x, y) from read_log
+    # - clock is the ReplayClock of the game
+    # - speed is how many times faster than real time to play, 0 for as fast as it can
+
+    step = 1000 // game.FPS
+    for ms, kind, x, y in events:
+        # play the frames between the events
+        while clock.now + step < ms and not game.close_clicked:
+            clock.now += step
+            game.frame()
+            if speed:
+                pygame.time.wait(int(step / speed))
+
+        if game.close_clicked:
+            break
+
+        # the event happens at the time it was recorded at
+        clock.now = ms
+        if kind == CLICK:
+            pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos = (x, y), button = 1))
+        elif kind == QUIT:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        else:
+            pygame.event.post(pygame.event.Event(pygame.VIDEORESIZE, size = (x, y), w = x, h = y))
+        game.frame()
+
+
+# User-defined classes
+
+class Game:
+    # An object in this class represents a complete game.
+
+    # Shared Attributes or Class Attributes
+    # the faces are loaded in the background while the board is shown
+    lazy_faces = True
+
+    def __init__(self, surface, rows = 4, cols = 4, profiler = None, seed = None, clock = None, recorder = None,
+                 players = 1, bots = 0, store = None, saved = None, saver = None):
+        # Initialize a Game.
+        # - self is the Game to initialize
+        # - surface is the display window surface object
+        # - rows is the number of rows of tiles
+        # - cols is the number of columns of tiles
+        # - profiler is the FrameProfiler that times the frames, None for no timing
+        # - seed is the seed of the shuffle of the board, None for a random one
+        # - clock is a function returning milliseconds, pygame.time.get_ticks if None
+        # - recorder is the InputRecorder the clicks are written to, None to not record
+        # - players is the number of players taking turns
+        # - bots is how many of the players, the last ones, are played by the solver
+        # - store is the ScoreStore a solved game of one player is added to, None to not keep it
+        # - saved is the Snapshot of a game to go on with, None for a new game
+        # - saver is the Autosaver the game is saved with after every move, None to not save it
+
+        # === objects that are part of every game
+
+        # the time the game started being made and how long it took
+        # until the first frame was shown
+        self.start_time = time.perf_counter()
+        self.first_frame_time = None
+
+        self.surface = surface
+        self.bg_color = pygame.Color('black')
+        self.fg_color = pygame.Color('white')
+        
+        # timing, frames and some inits for the game, the engine and the
+        # animations move on in steps of step milliseconds, at most
+        # max_steps of them in one frame
+        self.FPS = 60
+        self.step = 1000 // self.FPS
+        self.max_steps = self.FPS // 4
+        self.game_Clock = pygame.time.Clock()
+        self.time = 0
+        self.close_clicked = False
+        self.continue_game = True
+        self.frame_counter = 0
+
+        # the whole surface is drawn on the first frame, after that only
+        # the tiles that are flipping and the timer that changed are redrawn
+        self.redraw_all = True
+        self.time_rect = None
+        self.drawn_time = None
+
+        # the font is only looked up once and each digit is rendered once,
+        # the timer is then drawn by blitting the digits
+        self.font = pygame.font.SysFont('', 75)
+        self.digits = []
+        for digit in range(10):
+            self.digits.append(self.font.render(str(digit), True, self.fg_color, self.bg_color))
+        # the board leaves room on the right for a timer of three digits
+        self.timer_width = 3 * max(digit.get_width() for digit in self.digits)
+
+        # the frame times are shown in the bottom right corner when F3
+        # is pressed, and redrawn every overlay_delay ticks
+        self.profiler = profiler
+        self.show_overlay = False
+        self.overlay_font = None
+        self.overlay_rect = None
+        self.overlay_time = 0
+        self.overlay_delay = 250
+        
+        # === game specific objects
+        # the engine has the rules and the state of the whole board,
+        # the game only draws it and passes the clicks on
+        # a resumed game has the engine of its snapshot
+        if saved:
+            self.seed = saved.seed
+            self.engine = saved.engine
+        else:
+            self.seed = seed
+            self.engine = MemoryEngine(rows, cols, rng = random.Random(seed))
+        self.animator = FlipAnimator()
+
+        # with more than one player the turns and the pairs of each player
+        # are kept and shown under the timer
+        self.match = TurnEngine(players, self.engine) if players > 1 else None
+        if self.match and saved:
+            self.match.scores = saved.scores
+            self.match.turn = saved.turn
+        self.score_font = None
+        self.scores_rect = None
+        self.drawn_scores = None
+
+        # a solved game of one player is kept in the store and the best
+        # results of the board are shown under the timer, the result of
+        # this game is marked
+        self.store = store if players == 1 and not bots else None
+        self.best = None
+        self.best_rect = None
+        self.drawn_best = False
+        self.saver = saver
+
+        # the tiles the players have seen and what the solver knows from
+        # them, kept up to date on each flip, the bots flip a tile every
+        # bot_delay ticks and the H key outlines the tile the solver would
+        # flip next, the tables of the solver grow with the square of the
+        # tiles, so they are only filled up front when bots will need them
+        # and otherwise on the first hint
+        self.seen = saved.seen if saved else bytearray(rows * cols)
+        engine = self.engine
+        self.knowledge = Knowledge(engine.faces, self.seen, engine.state, engine.first, engine.pending)
+        if bots:
+            SOLVER.extend(rows * cols)
+        self.bots = bots
+        self.bot_delay = 500
+        self.bot_ticks = 0
+        self.hint = None
+        self.hint_shown = None
+        self.hint_color = pygame.Color('gold')
+        self.board = []
+        self.tiles = self.engine.faces
+        self.rows = rows
+        self.cols = cols
+        self.create_board()
+        self.text()
+
+        # clicked point, the ticks the game started at, the ticks the
+        # engine time was last moved on at and the milliseconds since then
+        # not yet stepped, which is how far a frame is between two steps
+        self.click_x, self.click_y = 0, 0
+        self.clock = clock or pygame.time.get_ticks
+        # the event a wait woke up for, handled by the next frame
+        self.woken_by = None
+        self.recorder = recorder
+        self.start_ticks = self.clock()
+        self.last_ticks = self.start_ticks
+        self.lag = 0
+
+    def create_board(self):
+        # create the board shown
+        # - self is the game class
+
+        # since the tiles are square only height is necessary,
+        # the layout fits the board to the window
+        self.layout = Layout(self.surface.get_size(), self.rows, self.cols, self.timer_width)
+        self.tile_height = self.layout.tile
+        self.atlas = Atlas(self.rows * self.cols // 2, self.tile_height, self.surface, Game.lazy_faces)
+        self.faces_loading = Game.lazy_faces
+
+        # inits index, the face numbers of self.tiles are shuffled
+        # by the engine and the faces are in self.atlas
+        index = 0
+
+        # for row and col in matrix (i.e. for every cell), create a tile class obj
+        # the board is only built once, update changes the tiles in place
+        for row_index in range(0, self.rows):
+            row = []
+            for col_index in range(0, self.cols):
+                x, y = self.layout.position(row_index, col_index)
+                row.append(Tile(index, x, y, self.tiles[index], self.tile_height))
+                index += 1
+
+            # append the list in the board list
+            # (this will be like a 4x4 matrix)
+            self.board.append(row)
+
+    def resize(self, size):
+        # fits the board to a new size of window, the faces are only
+        # made again if the size of the tiles changed
+        # - self is the Game
+        # - size is the width and height of the window
+
+        # a window resized by the player already has the size, a replayed one does not
+        if pygame.display.get_surface().get_size() != tuple(size):
+            pygame.display.set_mode(size, pygame.RESIZABLE)
+        self.surface = pygame.display.get_surface()
+
+        self.layout = Layout(self.surface.get_size(), self.rows, self.cols, self.timer_width)
+        if self.layout.tile != self.tile_height:
+            # faces made while the window is dragged are not kept on disk,
+            # a new window always starts at the same size
+            self.tile_height = self.layout.tile
+            self.atlas.close()
+            self.atlas = Atlas(self.rows * self.cols // 2, self.tile_height, self.surface, Game.lazy_faces, False)
+            self.faces_loading = Game.lazy_faces
+
+        for row_index, row in enumerate(self.board):
+            for col_index, each_tile in enumerate(row):
+                x, y = self.layout.position(row_index, col_index)
+                each_tile.place(x, y, self.tile_height)
+
+        # the whole window is drawn again, so nothing old needs clearing
+        self.redraw_all = True
+        self.time_rect = None
+        self.overlay_rect = None
+        self.scores_rect = None
+        self.best_rect = None
+
+    def play(self):
+        # Play the game until the player presses the close box.
+        # - self is the Game that should be continued or not.
+
+        self.frame()
+        while not self.close_clicked:  # until player clicks close box
+            # run at most with FPS Frames Per Second while something is moving,
+            # otherwise sleep until there is an event or something to change
+            if self.animating():
+                self.game_Clock.tick(self.FPS)
+            else:
+                self.wait_for_event()
+
+            # play frame
+            self.frame()
+
+    def frame(self):
+        # Play one frame of the game.
+        # - self is the Game to play a frame of
+
+        profiler = self.profiler
+        if profiler:
+            profiler.begin_frame()
+
+        # the event a wait woke up for is handled here with the ones
+        # after it, so the work it causes is timed like any other event
+        events = None
+        if self.woken_by:
+            events = [self.woken_by] + pygame.event.get()
+            self.woken_by = None
+        self.handle_events(events)
+        if profiler:
+            profiler.lap(0)
+
+        # move the time of the engine and the animations on in fixed steps,
+        # a wait for an event is too long to step through and the engine
+        # is moved on by the rest of it at once, nothing is flipping then
+        now = self.clock()
+        steps, self.lag = divmod(self.lag + now - self.last_ticks, self.step)
+        self.last_ticks = now
+        if steps > self.max_steps:
+            self.tick_engine((steps - self.max_steps) * self.step / 1000)
+            steps = self.max_steps
+        for i in range(steps):
+            self.tick_engine(self.step / 1000)
+            self.animator.step(self.step / 1000)
+
+        if self.continue_game:
+            self.update()
+            self.decide_continue()
+        if profiler:
+            profiler.lap(1)
+
+        # copy the faces that have loaded since the last frame into the atlas
+        if self.faces_loading:
+            self.faces_loading = self.atlas.poll()
+
+        self.draw()
+        if profiler:
+            profiler.end_frame()
+
+    def animating(self):
+        # returns if the game needs to draw frames without any events
+        # - self is the Game to check
+
+        # the tiles that are flipping move every frame, the faces that
+        # are still loading are picked up every frame and the bots play
+        return self.faces_loading or bool(self.animator.active()) or (self.continue_game and self.bot_turn())
+
+    def bot_turn(self):
+        # returns if the player whose turn it is is a bot
+        # - self is the Game
+
+        if self.match:
+            return self.match.turn >= self.match.players - self.bots
+        return self.bots > 0
+
+    def best_flip(self):
+        # returns the index of the tile the solver would flip next
+        # - self is the Game
+
+        index, expected = SOLVER.hint(self.knowledge, self.engine.first)
+        return index
+
+    def tick_engine(self, dt):
+        # moves the time of the engine on, this also hides a wrong pair
+        # that has been shown for long enough, which is flipped back over
+        # - self is the Game
+        # - dt is the number of seconds that passed
+
+        pending = self.engine.pending
+        self.engine.tick(dt)
+        if pending is not None and self.engine.pending is None:
+            self.flip_back(pending)
+
+    def flip_back(self, pair):
+        # flips the tiles of a wrong pair back over
+        # - self is the Game
+        # - pair is the indexes of the two tiles
+
+        for index in pair:
+            self.animator.start(index, False)
+
+    def wait_for_event(self):
+        # Sleep until there is an event, the time shown changes or the
+        # wrong pair has to be hidden, the event is kept for the next frame.
+        # - self is the Game that waits
+
+        now = int(self.engine.time * 1000)
+        wake_times = []
+
+        # the timer only changes while the game is going
+        if self.continue_game:
+            wake_times.append(1000 - now % 1000)
+        if self.engine.hide_time is not None:
+            wake_times.append(max(int(self.engine.hide_time * 1000) - now, 1))
+
+        # a timeout of 0 waits for the next event however long it takes
+        timeout = min(wake_times) if wake_times else 0
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            self.woken_by = event
+
+    def handle_events(self, events = None):
+        # Handle each user event by changing the game state appropriately.
+        # - self is the Game whose events will be handled
+        # - events is the list of events to handle, all queued events if None
+
+        # added click events
+        if events is None:
+            events = pygame.event.get()
+        # a drag of the window sends many sizes, only the last is used
+        size = None
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.close_clicked = True
+                if self.recorder:
+                    self.recorder.quit(self.clock() - self.start_ticks)
+            if event.type == pygame.MOUSEBUTTONUP:
+                self.click_x, self.click_y = event.pos
+                if self.recorder:
+                    self.recorder.click(self.clock() - self.start_ticks, *event.pos)
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and self.profiler:
+                self.show_overlay = not self.show_overlay
+                self.overlay_time = 0
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_h and self.continue_game:
+                self.hint = self.best_flip()
+            if event.type == pygame.VIDEORESIZE:
+                size = event.size
+        if size:
+            if self.recorder:
+                self.recorder.resize(self.clock() - self.start_ticks, *size)
+            self.resize(size)
+
+    def draw(self):
+        # Draw the game objects that changed since the last frame.
+        # - self is the Game to draw
+
+        dirty_rects = []
+
+        # clear the display surface on the first frame only
+        if self.redraw_all:
+            self.surface.fill(self.bg_color)
+            dirty_rects.append(self.surface.get_rect())
+
+        # Draw every tile on the first frame and after that only the tiles
+        # that are flipping, part of the way to the next step
+        alpha = self.lag / self.step
+        if self.redraw_all:
+            self.hint_shown = None
+            for each_row in self.board:
+                for each_tile in each_row:
+                    self.draw_tile(each_tile.current_state, alpha)
+        else:
+            for index in self.animator.active():
+                dirty_rects.append(self.draw_tile(index, alpha))
+
+        # outline the tile of the hint, again after each step of its flip,
+        # and draw the last one again without it
+        if self.hint != self.hint_shown and self.hint_shown is not None:
+            dirty_rects.append(self.draw_tile(self.hint_shown, alpha))
+        if self.hint is not None and (self.hint != self.hint_shown or self.hint in self.animator.active()):
+            hint_rect = self.draw_tile(self.hint, alpha)
+            pygame.draw.rect(self.surface, self.hint_color, hint_rect, max(hint_rect.width // 20, 2))
+            dirty_rects.append(hint_rect)
+        self.hint_shown = self.hint
+        self.animator.drop_finished()
+
+        # draws the frame times if they are shown or were just hidden
+        if self.profiler:
+            overlay_rect = self.overlay()
+            if overlay_rect:
+                dirty_rects.append(overlay_rect)
+            self.profiler.lap(2)
+
+        # draws text if the displayed time changed
+        time_rect = self.text(self.redraw_all)
+        if time_rect:
+            dirty_rects.append(time_rect)
+        scores_rect = self.scores(self.redraw_all)
+        if scores_rect:
+            dirty_rects.append(scores_rect)
+        best_rect = self.leaderboard(self.redraw_all)
+        if best_rect:
+            dirty_rects.append(best_rect)
+        if self.profiler:
+            self.profiler.lap(3)
+
+        self.redraw_all = False
+
+        # make only the changed areas appear on the display
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+        if self.profiler:
+            self.profiler.lap(4)
+
+        if self.first_frame_time is None:
+            self.first_frame_time = time.perf_counter() - self.start_time
+
+    def draw_tile(self, index, alpha):
+        # draws a tile as far over as it is flipped and returns its area
+        # - self is the Game
+        # - index is the index of the tile
+        # - alpha is how far the frame is between the last step and the next
+
+        each_tile = self.board[index // self.cols][index % self.cols]
+        if index in self.animator.active():
+            shown = self.animator.value(index, alpha)
+        else:
+            shown = self.engine.state[index]
+        each_tile.draw(self.surface, self.atlas, shown, self.bg_color)
+        return each_tile.rect
+
+    def overlay(self):
+        # displays the frame times of the profiler and returns the area
+        # that changed, or None if nothing was drawn
+        # - self is the Game
+
+        # hide the overlay once when it is turned off
+        if not self.show_overlay:
+            old_rect = self.overlay_rect
+            if old_rect:
+                self.surface.fill(self.bg_color, old_rect)
+                self.overlay_rect = None
+            return old_rect
+
+        # the numbers change every frame, so only redraw them every so often
+        now = pygame.time.get_ticks()
+        if self.overlay_rect and now - self.overlay_time < self.overlay_delay and not self.redraw_all:
+            return None
+        self.overlay_time = now
+
+        if not self.overlay_font:
+            self.overlay_font = pygame.font.Font(None, 20)
+        lines = [self.overlay_font.render(line, True, self.fg_color, self.bg_color)
+                 for line in self.profiler.lines()]
+
+        # the lines sit in the bottom right corner, below the timer
+        width = self.surface.get_width() - self.layout.right
+        height = sum(line.get_height() for line in lines)
+        overlay_rect = pygame.Rect(0, 0, width, height)
+        overlay_rect.bottomright = self.surface.get_rect().bottomright
+        self.surface.fill(self.bg_color, overlay_rect)
+
+        y = overlay_rect.y
+        for line in lines:
+            self.surface.blit(line, (overlay_rect.x + 4, y))
+            y += line.get_height()
+
+        self.overlay_rect = overlay_rect
+        return overlay_rect
+
+    def update(self):
+        # Update the game objects for the next frame.
+        # - self is the Game to update
+
+        # the tile under the click, the clicks on the turn of a bot are
+        # ignored and the bot flips the tile the solver picks instead
+        index = None
+        clicked = (self.click_x, self.click_y) != (0, 0)
+        if self.bot_turn():
+            clicked = False
+            now = self.clock()
+            if now - self.bot_ticks >= self.bot_delay:
+                index = self.best_flip()
+                self.bot_ticks = now
+        elif clicked:
+            tile = self.tile_at(self.click_x, self.click_y)
+            if tile:
+                index = tile.current_state
+
+        # a click while a wrong pair is still shown flips the pair
+        # back straight away so the click can start the next pair
+        pending = self.engine.pending
+        if pending is not None and (clicked or index is not None):
+            self.engine.hide_pair()
+            self.flip_back(pending)
+
+        # flip the tile, the engine ignores tiles that are already face up,
+        # with many players the tile is flipped for the player whose turn it is
+        if index is not None:
+            if self.match:
+                flipped = self.match.flip(self.match.turn, index) is not None
+            else:
+                flipped = self.engine.flip(index)
+            if flipped:
+                self.animator.start(index, True)
+                self.seen[index] = 1
+                self.knowledge.saw(index)
+                if self.engine.first is None and self.engine.pending is None:
+                    self.knowledge.matched(self.engine.faces[index])
+                self.hint = None
+                # the game is saved once each move is finished
+                if self.engine.first is None:
+                    self.autosave()
+
+        # sets clicked back to 0, 0 so a click is only used once
+        self.click_x, self.click_y = 0, 0
+
+        self.frame_counter = self.frame_counter + 1
+
+    def tile_at(self, x, y):
+        # returns the tile under a point, or None if the point is on the
+        # margin or the gap between tiles
+        # - self is the Game
+        # - x is the x coord of the point
+        # - y is the y coord of the point
+
+        cell = self.layout.cell_at(x, y)
+        if cell is None:
+            return None
+        row_index, col_index = cell
+        return self.board[row_index][col_index]
+
+    def decide_continue(self):
+        # Check and remember if the game should continue
+        # - self is the Game to check
+
+        # if all cards flipped,
+        # end the game 
+        self.continue_game = not self.engine.is_solved()
+        if not self.continue_game:
+            if self.store:
+                self.keep_score()
+            # a solved game is not resumed
+            if self.saver:
+                self.saver.remove()
+
+    def autosave(self):
+        # hands the game to the saver, once a move has been made and as
+        # long as it is not solved, so a game that was only opened never
+        # replaces the one saved before it
+        # - self is the Game
+
+        if self.saver and self.continue_game and self.engine.moves:
+            self.saver.save(self.snapshot())
+
+    def snapshot(self):
+        # returns the Snapshot of the game as it is now
+        # - self is the Game
+
+        if self.match:
+            return Snapshot(self.engine, self.seen, self.seed, self.match.players, self.bots,
+                            self.match.turn, self.match.scores)
+        return Snapshot(self.engine, self.seen, self.seed, 1, self.bots)
+
+    def keep_score(self):
+        # hands the result of the game to the store and looks up the best
+        # results of the board, with this one put in its place since the
+        # store may not have written it yet
+        # - self is the Game that was solved
+
+        engine = self.engine
+        self.store.add(self.seed, self.rows, self.cols, engine.time, engine.moves, engine.mismatches)
+        result = (engine.time, engine.moves, True)
+        best = []
+        if self.store.usable():
+            best = [(seconds, moves, False) for seconds, moves, mismatches, seed, played
+                    in self.store.top(self.rows, self.cols, 5)]
+        self.best = sorted(best + [result])[:5]
+        self.store = None
+
+    def text(self, force = False):
+        # displays the text score and returns the area that changed,
+        # or None if the time shown is the same as last frame
+        # - self is the Game class
+        # - force is if the text is drawn even when the time has not changed
+
+        # if the game is still going, display time
+        # else, do not change the time for the game has ended
+        if self.continue_game:
+            self.time = str(int(self.engine.time))
+
+        if self.time == self.drawn_time and not force:
+            return None
+
+        # the text box is as wide as the digits of the time
+        glyphs = [self.digits[int(digit)] for digit in self.time]
+        width = sum(glyph.get_width() for glyph in glyphs)
+
+        # displays text box at the top, right hand side
+        text_rect = pygame.Rect(0, 0, width, self.digits[0].get_height())
+        text_rect.right = self.surface.get_width()
+
+        # clear the old time, since the new one may be narrower
+        dirty_rect = text_rect
+        if self.time_rect:
+            self.surface.fill(self.bg_color, self.time_rect)
+            dirty_rect = text_rect.union(self.time_rect)
+
+        # prints each digit to surface
+        x = text_rect.x
+        for glyph in glyphs:
+            self.surface.blit(glyph, (x, text_rect.y))
+            x += glyph.get_width()
+        self.time_rect = text_rect
+        self.drawn_time = self.time
+
+        return dirty_rect
+
+
+    def scores(self, force = False):
+        # displays the pairs of each player under the timer, marking whose
+        # turn it is or the winners once the board is solved, and returns
+        # the area that changed, or None if nothing changed
+        # - self is the Game
+        # - force is if the scores are drawn even when they have not changed
+
+        if not self.match:
+            return None
+
+        solved = self.engine.is_solved()
+        shown = (bytes(self.match.scores), self.match.turn, solved)
+        if shown == self.drawn_scores and not force:
+            return None
+        self.drawn_scores = shown
+
+        if not self.score_font:
+            self.score_font = pygame.font.Font(None, 30)
+        marked = self.match.winners() if solved else [self.match.turn]
+        lines = []
+        for player in range(self.match.players):
+            mark = ('*' if solved else '>') if player in marked else ' '
+            line = '%s P%d %d' % (mark, player + 1, self.match.scores[player])
+            lines.append(self.score_font.render(line, True, self.fg_color, self.bg_color))
+
+        # the lines sit on the right hand side, under the timer
+        width = max(line.get_width() for line in lines)
+        height = sum(line.get_height() for line in lines)
+        scores_rect = pygame.Rect(0, self.digits[0].get_height(), width, height)
+        scores_rect.right = self.surface.get_width()
+
+        dirty_rect = scores_rect
+        if self.scores_rect:
+            self.surface.fill(self.bg_color, self.scores_rect)
+            dirty_rect = scores_rect.union(self.scores_rect)
+
+        y = scores_rect.y
+        for line in lines:
+            self.surface.blit(line, (scores_rect.right - line.get_width(), y))
+            y += line.get_height()
+        self.scores_rect = scores_rect
+        return dirty_rect
+
+
+    def leaderboard(self, force = False):
+        # displays the best results of the board under the timer once the
+        # game is solved, and returns the area that changed, or None if
+        # nothing changed
+        # - self is the Game
+        # - force is if the results are drawn again
+
+        if not self.best or (self.drawn_best and not force):
+            return None
+        self.drawn_best = True
+
+        if not self.score_font:
+            self.score_font = pygame.font.Font(None, 30)
+        lines = []
+        for place, (seconds, moves, current) in enumerate(self.best, 1):
+            color = self.hint_color if current else self.fg_color
+            line = '%d. %ds %d' % (place, int(seconds), moves)
+            lines.append(self.score_font.render(line, True, color, self.bg_color))
+
+        # the lines sit on the right hand side, under the timer
+        width = max(line.get_width() for line in lines)
+        height = sum(line.get_height() for line in lines)
+        best_rect = pygame.Rect(0, self.digits[0].get_height(), width, height)
+        best_rect.right = self.surface.get_width()
+
+        dirty_rect = best_rect
+        if self.best_rect:
+            self.surface.fill(self.bg_color, self.best_rect)
+            dirty_rect = best_rect.union(self.best_rect)
+
+        y = best_rect.y
+        for line in lines:
+            self.surface.blit(line, (best_rect.right - line.get_width(), y))
+            y += line.get_height()
+        self.best_rect = best_rect
+        return dirty_rect
+
+
+class Layout:
+    # An object in this class is where the tiles of a board go in a
+    # window of some size. The tiles are as big as fit in the window
+    # next to the timer, with a gap between them, and the board is
+    # centred in the space that is left over.
+
+    __slots__ = ['rows', 'cols', 'tile', 'pitch', 'x', 'y', 'right', 'bottom']
+
+    def __init__(self, size, rows, cols, side = 0, gap = 1, margin = 2):
+        # Initialize a Layout.
+        # - self is the Layout to initialize
+        # - size is the width and height of the window
+        # - rows is the number of rows of tiles
+        # - cols is the number of columns of tiles
+        # - side is the width kept free on the right of the window
+        # - gap is the space between two tiles
+        # - margin is the least space around the board
+
+        width, height = size
+        self.rows = rows
+        self.cols = cols
+
+        # added margins
+        # sourced from
+        # https://stackoverflow.com/questions/41886369/pygame-offset-a-grid-made-out-of-rectangles (first answer)
+        # the pitch of a cell is a tile plus the gap after it, the last
+        # tile of a row or column has no gap after it
+        free_width = width - side - 2*margin
+        free_height = height - 2*margin
+        self.pitch = max(min((free_width + gap) // cols, (free_height + gap) // rows), gap + 1)
+        self.tile = self.pitch - gap
+
+        # the top left corner of the board and the bottom right after it
+        self.x = margin + max(free_width - (cols * self.pitch - gap), 0) // 2
+        self.y = margin + max(free_height - (rows * self.pitch - gap), 0) // 2
+        self.right = self.x + cols * self.pitch - gap
+        self.bottom = self.y + rows * self.pitch - gap
+
+    def position(self, row_index, col_index):
+        # returns the top left coords of the tile of a cell
+        # - self is the Layout
+        # - row_index is the row number of the cell
+        # - col_index is the column number of the cell
+
+        return self.x + col_index * self.pitch, self.y + row_index * self.pitch
+
+    def cell_at(self, x, y):
+        # returns the row and column of the tile under a point, or None if
+        # the point is on the margin or the gap between tiles, the cell is
+        # found by dividing by the pitch so it takes the same time on any
+        # board size
+        # - self is the Layout
+        # - x is the x coord of the point
+        # - y is the y coord of the point
+
+        col_index, x_offset = divmod(x - self.x, self.pitch)
+        row_index, y_offset = divmod(y - self.y, self.pitch)
+
+        # outside of the board
+        if not (0 <= col_index < self.cols and 0 <= row_index < self.rows):
+            return None
+
+        # in the gap after the tile
+        if x_offset >= self.tile or y_offset >= self.tile:
+            return None
+
+        return row_index, col_index
+
+
+class Tile:
+    # An object in this class represents a Tile, the state of the tile
+    # is kept by the engine of its game
+
+    # only these attributes, so the many tiles of a big board stay small
+    __slots__ = ['x', 'y', 'current_state', 'image', 'rect']
+
+    # Instance Methods
+    def __init__(self, index, x, y, image, height):
+        # Initialize a Tile.
+        # - self is the Tile to initialize
+        # - index is the index of tile
+        # - x is the x coord of the top left of the tile
+        # - y is the y coord of the top left of the tile
+        # - image is the number of the face of the tile in the atlas
+        # - height is the width and height of the tile
+
+        self.current_state = index
+        self.image = image
+        self.place(x, y, height)
+
+    def place(self, x, y, height):
+        # moves the tile and changes its size
+        # - self is the Tile
+        # - x is the x coord of the top left of the tile
+        # - y is the y coord of the top left of the tile
+        # - height is the width and height of the tile
+
+        self.x = x
+        self.y = y
+
+        # area of the tile
+        self.rect = pygame.Rect(self.x, self.y, height, height)
+
+    def draw(self, surface, atlas, shown, bg_color):
+        # Draw the tile on the surface, a tile part of the way over is
+        # squeezed from the side, showing the question mark for the first
+        # half of the flip and the face for the second half
+        # - self is the Tile
+        # - surface is the surface to draw on
+        # - atlas is the Atlas with the faces of the board
+        # - shown is how far the tile is flipped (0 = face down, 1 = face up)
+        # - bg_color is the colour behind a squeezed tile
+
+        face_id = self.image if shown >= 0.5 else 0
+        if shown == 0 or shown == 1:
+            atlas.blit(surface, face_id, (self.x, self.y))
+            return
+
+        width = max(int(self.rect.width * abs(1 - 2*shown)), 1)
+        surface.fill(bg_color, self.rect)
+        atlas.blit_scaled(surface, face_id, pygame.Rect(0, 0, width, self.rect.height).move(
+            self.rect.centerx - width // 2, self.y))
+
+
+class Faces:
+    # Faces are the images of the tiles, no object of this class is made.
+    # Face 0 is the question mark, face n is loaded from imagen.bmp if
+    # there is one or else drawn from a colour, a shape and a number.
+    # Each face is made once per size and kept, the faces used least
+    # recently are dropped once they take more than cache_limit bytes,
+    # so dragging the size of the window does not keep every size.
+    # Faces are also saved on disk as the raw pixels of the display
+    # format, named by the hash of what the face is made from and its
+    # size, so later runs read them back without decoding or drawing anything.
+
+    # Shared Attributes or Class Attributes
+    folder = os.path.dirname(os.path.realpath(__file__))
+    cache = OrderedDict()
+    cache_limit = 32 * 1024 * 1024
+    cache_bytes = 0
+    cache_folder = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+                                'memory')
+    # change this when generate draws different faces, so the old ones are not used
+    version = 1
+    fonts = {}
+    bg_color = pygame.Color('gray20')
+    colors = ['red', 'orange', 'yellow', 'green', 'cyan', 'dodgerblue', 'purple', 'magenta']
+    shapes = ['circle', 'square', 'triangle', 'diamond', 'cross', 'ring']
+
+    @classmethod
+    def get(cls, face_id, size):
+        # returns the face scaled to size by size
+        # - cls is the class (i.e. Faces)
+        # - face_id is the number of the face
+        # - size is the width and height of the face
+
+        key = (face_id, size)
+        if key in cls.cache:
+            cls.cache.move_to_end(key)
+            return cls.cache[key]
+        face = cls.make(face_id, size)
+        cls.keep(face_id, size, face)
+        return face
+
+    @classmethod
+    def keep(cls, face_id, size, face):
+        # keeps a face in the cache in memory, dropping the faces used
+        # least recently while the cache is too big
+        # - cls is the class (i.e. Faces)
+        # - face_id is the number of the face
+        # - size is the width and height of the face
+        # - face is the surface of the face
+
+        key = (face_id, size)
+        if key in cls.cache:
+            cls.cache_bytes -= cls.size_of(cls.cache.pop(key))
+        cls.cache[key] = face
+        cls.cache_bytes += cls.size_of(face)
+
+        # the newest face is always kept, however big it is
+        while cls.cache_bytes > cls.cache_limit and len(cls.cache) > 1:
+            key, old = cls.cache.popitem(last = False)
+            cls.cache_bytes -= cls.size_of(old)
+
+    @classmethod
+    def clear(cls):
+        # drops every face in the cache in memory
+        # - cls is the class (i.e. Faces)
+
+        cls.cache.clear()
+        cls.cache_bytes = 0
+
+    @staticmethod
+    def size_of(face):
+        # returns the number of bytes of the pixels of a face
+        # - face is the surface of the face
+
+        return face.get_width() * face.get_height() * face.get_bytesize()
+
+    @classmethod
+    def make(cls, face_id, size, draw = True, save = True):
+        # returns the face scaled to size by size from the cache on disk,
+        # or else loads or draws it and saves it to the cache on disk, it
+        # does not use the cache in memory so it can run on another thread
+        # - cls is the class (i.e. Faces)
+        # - face_id is the number of the face
+        # - size is the width and height of the face
+        # - draw is if a face with no file is drawn, if not None is returned for it
+        # - save is if a face that was not on disk is saved there
+
+        # a face is named by the bytes of its file or the face drawn for it
+        path = cls.path(face_id)
+        if path:
+            with open(path, 'rb') as image:
+                source = image.read()
+        else:
+            source = ('face %d drawn by version %d' % (face_id, cls.version)).encode()
+
+        display = pygame.display.get_surface()
+        cached = cls.cache_path(source, size, display)
+        face = cls.read_cached(cached, size, display)
+        if face:
+            return face
+
+        if path:
+            face = cls.load(io.BytesIO(source), size)
+        elif draw:
+            face = cls.generate(face_id, size)
+        else:
+            return None
+        if save:
+            cls.write_cached(cached, face, display)
+        return face
+
+    @classmethod
+    def cache_path(cls, source, size, display):
+        # returns the file of a face in the cache on disk, or None if there
+        # is no cache folder or no display to take the pixel format from
+        # - cls is the class (i.e. Faces)
+        # - source is the bytes the face is made from
+        # - size is the width and height of the face
+        # - display is the display surface
+
+        if not cls.cache_folder or not display:
+            return None
+        digest = hashlib.sha1(source).hexdigest()
+        pixel_format = '%d-%x-%x-%x-%x' % ((display.get_bitsize(),) + tuple(display.get_masks()))
+        return os.path.join(cls.cache_folder, '%s-%d-%s.raw' % (digest, size, pixel_format))
+
+    @classmethod
+    def read_cached(cls, cached, size, display):
+        # returns the face saved in the cache on disk, or None if it is not
+        # there, the pixels are copied straight from a memory map of the file,
+        # a row at a time if the rows of the surface are padded
+        # - cls is the class (i.e. Faces)
+        # - cached is the file of the face, or None
+        # - size is the width and height of the face
+        # - display is the display surface
+
+        if not cached or not os.path.exists(cached):
+            return None
+
+        face = pygame.Surface((size, size), 0, display)
+        row = size * face.get_bytesize()
+        pitch = face.get_pitch()
+        buffer = face.get_buffer()
+        pixels = memoryview(buffer)
+        try:
+            with open(cached, 'rb') as raw:
+                with mmap.mmap(raw.fileno(), 0, access = mmap.ACCESS_READ) as saved:
+                    if len(saved) != row * size:
+                        return None
+                    if pitch == row:
+                        pixels[:] = saved
+                    else:
+                        for y in range(size):
+                            pixels[y * pitch:y * pitch + row] = saved[y * row:(y + 1) * row]
+        except (OSError, ValueError):
+            return None
+        finally:
+            # the surface stays locked until its buffer is let go
+            pixels.release()
+            del buffer
+        return face
+
+    @classmethod
+    def write_cached(cls, cached, face, display):
+        # saves the pixels of a face in the display format to the cache on
+        # disk, without the padding at the end of each row
+        # - cls is the class (i.e. Faces)
+        # - cached is the file of the face, or None
+        # - face is the surface of the face
+        # - display is the display surface
+
+        if not cached:
+            return
+
+        converted = pygame.Surface(face.get_size(), 0, display)
+        converted.blit(face, (0, 0))
+        width, height = converted.get_size()
+        row = width * converted.get_bytesize()
+        pitch = converted.get_pitch()
+        try:
+            pixels = converted.get_buffer().raw
+            if pitch != row:
+                pixels = b''.join([pixels[y * pitch:y * pitch + row] for y in range(height)])
+            os.makedirs(cls.cache_folder, exist_ok = True)
+            # write to a file of its own first, so no one reads half a face
+            partial = '%s.%d.%d' % (cached, os.getpid(), id(face))
+            with open(partial, 'wb') as raw:
+                raw.write(pixels)
+            os.replace(partial, cached)
+        except (OSError, ValueError):
+            pass
+
+    @classmethod
+    def path(cls, face_id):
+        # returns the image file of the face, or None if it has none
+        # - cls is the class (i.e. Faces)
+        # - face_id is the number of the face
+
+        path = os.path.join(cls.folder, 'image' + str(face_id) + '.bmp')
+        if os.path.exists(path):
+            return path
+        return None
+
+    @classmethod
+    def load(cls, path, size):
+        # returns the face in an image file scaled to size by size, it
+        # does not use the cache so it can run on another thread
+        # - cls is the class (i.e. Faces)
+        # - path is the image file, or a file object of its bytes
+        # - size is the width and height of the face
+
+        face = pygame.image.load(path)
+        if face.get_size() != (size, size):
+            face = pygame.transform.smoothscale(face, (size, size))
+        return face
+
+    @classmethod
+    def generate(cls, face_id, size):
+        # draws a face that has no image file, every face_id gets
+        # a different colour, shape and number
+        # - cls is the class (i.e. Faces)
+        # - face_id is the number of the face
+        # - size is the width and height of the face
+
+        n = face_id - 1
+        color = pygame.Color(cls.colors[n % len(cls.colors)])
+        n //= len(cls.colors)
+        shape = cls.shapes[n % len(cls.shapes)]
+        number = n // len(cls.shapes)
+
+        face = pygame.Surface((size, size))
+        face.fill(cls.bg_color)
+
+        # the shape fills the face apart from a margin
+        margin = max(size // 8, 1)
+        rect = pygame.Rect(margin, margin, size - 2*margin, size - 2*margin)
+        if shape == 'circle':
+            pygame.draw.ellipse(face, color, rect)
+        elif shape == 'square':
+            pygame.draw.rect(face, color, rect)
+        elif shape == 'triangle':
+            pygame.draw.polygon(face, color, [rect.midtop, rect.bottomright, rect.bottomleft])
+        elif shape == 'diamond':
+            pygame.draw.polygon(face, color, [rect.midtop, rect.midright, rect.midbottom, rect.midleft])
+        elif shape == 'cross':
+            bar = max(rect.width // 3, 1)
+            pygame.draw.rect(face, color, (rect.x, rect.centery - bar//2, rect.width, bar))
+            pygame.draw.rect(face, color, (rect.centerx - bar//2, rect.y, bar, rect.height))
+        else:
+            pygame.draw.ellipse(face, color, rect, max(size // 10, 1))
+
+        # once every colour and shape is used, a number tells them apart
+        if number:
+            if size not in cls.fonts:
+                cls.fonts[size] = pygame.font.Font(None, max(size // 2, 8))
+            label = cls.fonts[size].render(str(number), True, pygame.Color('white'), cls.bg_color)
+            face.blit(label, label.get_rect(center = face.get_rect().center))
+
+        return face
+
+class Atlas:
+    # An object in this class holds all the faces of a board packed into
+    # one surface that has the pixel format of the display, so drawing a
+    # tile is one blit of part of the atlas with no format conversion.
+    # A lazy atlas only has the question mark at first, the image files
+    # and the faces cached on disk are read on a thread pool and the
+    # other faces are drawn a few at a time by poll, and a face that is
+    # needed before then is waited for or drawn straight away. A face
+    # whose file cannot be read or decoded is drawn like a face with no file.
+
+    def __init__(self, face_count, size, display, lazy = False, save = True):
+        # Initialize an Atlas.
+        # - self is the Atlas to initialize
+        # - face_count is the number of faces, not counting the question mark
+        # - size is the width and height of a face
+        # - display is the surface whose pixel format the atlas uses
+        # - lazy is if the faces are loaded later instead of now
+        # - save is if faces that are not on disk yet are saved there
+
+        # the faces are packed in a square grid, face 0 is the question mark
+        self.columns = 1
+        while self.columns * self.columns < face_count + 1:
+            self.columns += 1
+        rows = (face_count + self.columns) // self.columns
+
+        self.size = size
+        self.save = save
+        self.surface = pygame.Surface((self.columns * size, rows * size), 0, display)
+        self.areas = []
+        for face_id in range(face_count + 1):
+            area = pygame.Rect((face_id % self.columns) * size, (face_id // self.columns) * size, size, size)
+            self.areas.append(area)
+
+        # which faces are in the atlas, the faces being read, the faces
+        # still to draw and the ids of the faces that have been read
+        self.loaded = bytearray(face_count + 1)
+        self.loading = {}
+        self.generating = []
+        self.done = queue.SimpleQueue()
+        self.executor = None
+
+        # the question mark is always there from the start
+        self.store(0, self.get(0))
+        for face_id in range(1, face_count + 1):
+            if not lazy or (face_id, size) in Faces.cache:
+                self.store(face_id, self.get(face_id))
+                continue
+
+            # faces are only drawn on this thread, so the threads
+            # return None for a face that is not a file or cached
+            if not self.executor:
+                self.executor = ThreadPoolExecutor()
+            future = self.executor.submit(Faces.make, face_id, size, False, save)
+            future.add_done_callback(lambda future, face_id = face_id: self.done.put(face_id))
+            self.loading[face_id] = future
+
+    def get(self, face_id):
+        # returns a face from the cache in memory, or else makes it now
+        # - self is the Atlas
+        # - face_id is the number of the face
+
+        if (face_id, self.size) in Faces.cache:
+            return Faces.get(face_id, self.size)
+        try:
+            return Faces.make(face_id, self.size, True, self.save)
+        except (pygame.error, OSError, ValueError):
+            return Faces.generate(face_id, self.size)
+
+    def result(self, face_id):
+        # returns the face a thread read, None if it has no file, or the
+        # face drawn instead if its file could not be read
+        # - self is the Atlas
+        # - face_id is the number of the face
+
+        try:
+            return self.loading.pop(face_id).result()
+        except (pygame.error, OSError, ValueError):
+            return Faces.generate(face_id, self.size)
+
+    def store(self, face_id, face):
+        # copies a face into the atlas
+        # - self is the Atlas
+        # - face_id is the number of the face
+        # - face is the surface of the face
+
+        Faces.keep(face_id, self.size, face)
+        self.surface.blit(face, self.areas[face_id])
+        self.loaded[face_id] = 1
+
+    def poll(self, budget = 8):
+        # copies the faces that have been read into the atlas and draws
+        # a few of the other faces, returns if any face is still missing
+        # - self is the Atlas
+        # - budget is the most faces drawn in one call
+
+        while not self.done.empty():
+            face_id = self.done.get()
+            if not self.loaded[face_id]:
+                face = self.result(face_id)
+                if face:
+                    self.store(face_id, face)
+                else:
+                    self.generating.append(face_id)
+
+        for i in range(min(budget, len(self.generating))):
+            face_id = self.generating.pop()
+            if not self.loaded[face_id]:
+                self.store(face_id, self.get(face_id))
+
+        # the threads are not needed once every face has been read
+        if self.executor and not self.loading:
+            self.executor.shutdown(wait = False)
+            self.executor = None
+
+        return bool(self.loading or self.generating)
+
+    def ensure(self, face_id):
+        # puts a face in the atlas now, waiting for it if it is still
+        # being read
+        # - self is the Atlas
+        # - face_id is the number of the face
+
+        face = None
+        if face_id in self.loading:
+            face = self.result(face_id)
+        if not face:
+            face = self.get(face_id)
+        self.store(face_id, face)
+
+    def close(self):
+        # stops reading the faces that are not read yet, for an atlas
+        # that is not used any more
+        # - self is the Atlas
+
+        if self.executor:
+            self.executor.shutdown(wait = False, cancel_futures = True)
+            self.executor = None
+
+    def blit(self, target, face_id, position):
+        # draws a face on to a surface
+        # - self is the Atlas
+        # - target is the surface to draw on
+        # - face_id is the number of the face
+        # - position is the top left coords to draw the face at
+
+        if not self.loaded[face_id]:
+            self.ensure(face_id)
+        target.blit(self.surface, position, self.areas[face_id])
+
+    def blit_scaled(self, target, face_id, rect):
+        # draws a face on to a surface scaled to fill a rectangle
+        # - self is the Atlas
+        # - target is the surface to draw on
+        # - face_id is the number of the face
+        # - rect is the area to draw the face in
+
+        if not self.loaded[face_id]:
+            self.ensure(face_id)
+        face = self.surface.subsurface(self.areas[face_id])
+        target.blit(pygame.transform.scale(face, rect.size), rect)
+
+if __name__ == '__main__':
+    main()
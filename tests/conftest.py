@@ -0,0 +1,28 @@
+# Memory Tests - Andrew Li
+# Shared set up of the tests: pygame draws to a window that is never
+# shown, and the faces are cached in a folder of the test instead of
+# the cache folder of the user.
+
+# import os for the drivers and pytest for the fixtures
+import os
+
+import pytest
+
+# the drivers are picked when pygame starts, so they are set first
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+
+@pytest.fixture
+def surface(tmp_path, monkeypatch):
+    # a window of the size the game opens with, pygame is quit afterwards
+    import pygame
+    from memory import v3
+
+    monkeypatch.setattr(v3.Faces, 'cache_folder', str(tmp_path / 'faces'))
+    v3.Faces.clear()
+    pygame.init()
+    pygame.display.set_mode((520, 415), pygame.RESIZABLE)
+    yield pygame.display.get_surface()
+    v3.Faces.clear()
+    pygame.quit()
@@ -0,0 +1,49 @@
+# Memory Batch Tests - Andrew Li
+# Every board of a batch is made of pairs, the players of a batch take
+# as many moves as the solver expects, and solved games stop playing.
+
+import sys
+
+import pytest
+
+np = pytest.importorskip('numpy')
+from memory.batch import BatchEngine, main
+from memory.solver import Solver
+
+
+def test_faces_are_pairs():
+    batch = BatchEngine(100, 4, 6, np.random.default_rng(1))
+    for faces, partner in zip(batch.faces, batch.partner):
+        assert sorted(faces) == sorted(list(range(12)) * 2)
+        assert (faces[partner] == faces).all()
+        assert (partner != np.arange(24)).all()
+
+
+def test_perfect_player_expects_the_solver():
+    batch = BatchEngine(50000, 4, 4, np.random.default_rng(0))
+    batch.play('perfect')
+    assert batch.solved.all()
+    assert batch.moves.mean() == pytest.approx(Solver().expected(16, 0), abs = 0.05)
+    assert (batch.moves == batch.mismatches + 8).all()
+
+
+def test_solved_games_are_skipped():
+    batch = BatchEngine(2, 1, 2, np.random.default_rng(0))
+    batch.solved[0] = True
+    batch.step(np.array([0, 0]), np.array([1, 1]))
+    assert batch.moves.tolist() == [0, 1]
+    assert batch.matched.tolist() == [[False, False], [True, True]]
+    assert batch.solved.tolist() == [True, True]
+
+
+@pytest.mark.parametrize('argv', [
+    ['--games', '0'],
+    ['--batch', '0'],
+    ['--rows', '3', '--cols', '3'],
+    ['--memory', '-1'],
+])
+def test_wrong_options_exit(argv, monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['batch'] + argv)
+    with pytest.raises(SystemExit) as exit:
+        main()
+    assert exit.value.code == 2
@@ -0,0 +1,131 @@
+# Memory Board Tests - Andrew Li
+# The board of v2 and v3 is built once and changed in place, so a long
+# game keeps the same tiles and its memory stays flat. Each game plays
+# 10000 frames with scripted clicks on a window that is never shown.
+
+# import gc and tracemalloc to measure the memory, random for the clicks
+import gc
+import random
+import tracemalloc
+
+import pygame
+
+from memory import v2, v3
+from memory.profile import FrameProfiler
+from memory.replay import ReplayClock
+
+
+FRAMES = 10000
+WARM_UP = 500
+
+# the most the objects and the memory may grow by over the frames,
+# a board that grew by one row a frame would be far past both
+OBJECT_GROWTH = 1000
+MEMORY_GROWTH = 256 * 1024
+
+
+# User-defined functions
+
+def click(position):
+    # posts a click of the left mouse button
+    # - position is the x and y coords of the click
+
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos = position, button = 1))
+
+
+def measure(frame, clicks):
+    # plays the frames and returns how much the objects and the memory
+    # grew after the warm up
+    # - frame is the function that plays one frame
+    # - clicks is the function that returns the click of a frame, or None
+
+    def play(frames):
+        for i in range(frames):
+            position = clicks()
+            if position:
+                click(position)
+            frame()
+
+    play(WARM_UP)
+    gc.collect()
+    objects = len(gc.get_objects())
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        play(FRAMES)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return len(gc.get_objects()) - objects, after - before
+
+
+def test_v2_board_stays_bounded(surface):
+    game = v2.Game(surface)
+    rng = random.Random(1)
+    size = surface.get_height() // game.board_size
+
+    def frame():
+        game.handle_events()
+        game.draw()
+        if game.continue_game:
+            game.update()
+            game.decide_continue()
+
+    def clicks():
+        if rng.random() < 0.05:
+            return rng.randrange(game.board_size * size), rng.randrange(game.board_size * size)
+        return None
+
+    objects, memory = measure(frame, clicks)
+    assert len(game.board) == game.board_size
+    assert all(len(row) == game.board_size for row in game.board)
+    assert objects < OBJECT_GROWTH
+    assert memory < MEMORY_GROWTH
+
+
+def test_v3_board_stays_bounded(surface):
+    clock = ReplayClock()
+    game = v3.Game(surface, 6, 6, seed = 1, clock = clock)
+    rng = random.Random(1)
+
+    def frame():
+        clock.now += game.step
+        game.frame()
+
+    def clicks():
+        if rng.random() < 0.1:
+            row_index, col_index = rng.randrange(game.rows), rng.randrange(game.cols)
+            x, y = game.layout.position(row_index, col_index)
+            return x + 1, y + 1
+        return None
+
+    try:
+        objects, memory = measure(frame, clicks)
+    finally:
+        game.atlas.close()
+    assert len(game.board) == game.rows
+    assert all(len(row) == game.cols for row in game.board)
+    assert game.engine.moves > 0
+    assert objects < OBJECT_GROWTH
+    assert memory < MEMORY_GROWTH
+
+
+def test_woken_event_is_handled_in_the_frame(surface):
+    # the click a wait wakes up for is handled in the handle_events phase
+    # of the next frame, where the profiler times it
+    profiler = FrameProfiler()
+    clock = ReplayClock()
+    game = v3.Game(surface, 4, 4, profiler, seed = 1, clock = clock)
+    try:
+        game.frame()
+        x, y = game.layout.position(0, 0)
+        click((x + 1, y + 1))
+        game.wait_for_event()
+        assert game.engine.first is None
+        clock.now += game.step
+        game.frame()
+        assert game.engine.first == 0
+        assert game.woken_by is None
+    finally:
+        game.atlas.close()
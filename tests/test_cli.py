@@ -0,0 +1,37 @@
+# Memory Command Tests - Andrew Li
+# Wrong options of the memory command are reported by parse_options
+# before a window is opened.
+
+import pytest
+
+from memory.cli import parse_options
+
+
+def test_default_board():
+    args = parse_options([])
+    assert (args.rows, args.cols, args.players, args.bots) == (4, 4, 1, 0)
+
+
+def test_biggest_board():
+    args = parse_options(['--rows', '64', '--cols', '64'])
+    assert (args.rows, args.cols) == (64, 64)
+
+
+@pytest.mark.parametrize('argv', [
+    ['--rows', '3', '--cols', '3'],
+    ['--rows', '0'],
+    ['--cols', '-2'],
+    ['--rows', '400', '--cols', '400'],
+    ['--rows', '2', '--cols', '65'],
+    ['--players', '0'],
+    ['--players', '256'],
+    ['--seed', '-1'],
+    ['--seed', str(2**63)],
+    ['--players', '2', '--bots', '3'],
+    ['--players', '2', '--record', 'game.log'],
+])
+def test_wrong_options_exit(argv, capsys):
+    with pytest.raises(SystemExit) as exit:
+        parse_options(argv)
+    assert exit.value.code == 2
+    assert 'error' in capsys.readouterr().err
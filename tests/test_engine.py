@@ -0,0 +1,80 @@
+# Memory Engine Tests - Andrew Li
+# The rules of engine.py: pairs are matched, wrong pairs are shown for
+# the reveal delay and the time stops once the board is solved.
+
+import random
+
+import pytest
+
+from memory.engine import MemoryEngine
+
+
+# User-defined functions
+
+def pairs(engine):
+    # returns the two tiles of every face of a board
+    # - engine is the MemoryEngine of the board
+
+    tiles = {}
+    for index, face in enumerate(engine.faces):
+        tiles.setdefault(face, []).append(index)
+    return list(tiles.values())
+
+
+def test_board_has_every_face_twice():
+    engine = MemoryEngine(4, 6, rng = random.Random(3))
+    assert sorted(engine.faces) == sorted(list(range(1, 13)) * 2)
+    assert all(len(tiles) == 2 for tiles in pairs(engine))
+
+
+def test_boards_must_be_even_and_full():
+    with pytest.raises(ValueError):
+        MemoryEngine(3, 3)
+    with pytest.raises(ValueError):
+        MemoryEngine(2, 2, faces = [1, 1, 2])
+
+
+def test_match_stays_face_up():
+    engine = MemoryEngine(2, 2, faces = [1, 2, 1, 2])
+    assert engine.flip(0)
+    assert engine.first == 0
+    assert engine.flip(2)
+    assert (engine.moves, engine.matches, engine.mismatches) == (1, 1, 0)
+    assert engine.pending is None
+    assert not engine.flip(0)
+    assert engine.state[0] and engine.state[2]
+
+
+def test_wrong_pair_is_hidden_after_the_delay():
+    engine = MemoryEngine(2, 2, reveal_delay = 1.0, faces = [1, 2, 1, 2])
+    engine.flip(0)
+    engine.flip(1)
+    assert engine.pending == (0, 1)
+    engine.tick(0.5)
+    assert engine.pending == (0, 1)
+    engine.tick(0.5)
+    assert engine.pending is None
+    assert not engine.state[0] and not engine.state[1]
+    assert engine.mismatches == 1
+
+
+def test_flip_hides_a_wrong_pair_at_once():
+    engine = MemoryEngine(2, 2, faces = [1, 2, 1, 2])
+    engine.flip(0)
+    engine.flip(1)
+    assert engine.flip(3)
+    assert engine.pending is None
+    assert engine.first == 3
+    assert list(engine.state) == [0, 0, 0, 1]
+
+
+def test_time_stops_once_solved():
+    engine = MemoryEngine(2, 4, rng = random.Random(1))
+    for first, second in pairs(engine):
+        engine.tick(1.0)
+        engine.flip(first)
+        engine.flip(second)
+    assert engine.is_solved()
+    assert engine.score() == 4
+    engine.tick(5.0)
+    assert engine.time == 4.0
@@ -0,0 +1,53 @@
+# Memory Faces Tests - Andrew Li
+# The faces of v3 are read from image files on a thread pool and
+# cached on disk, a file that is broken is drawn instead.
+
+import os
+import shutil
+
+import pytest
+
+from memory import v3
+
+
+@pytest.fixture
+def broken_folder(tmp_path, monkeypatch):
+    # a folder of the faces where image1.bmp is not an image
+    folder = tmp_path / 'images'
+    folder.mkdir()
+    for name in os.listdir(v3.Faces.folder):
+        if name.endswith('.bmp'):
+            shutil.copy(os.path.join(v3.Faces.folder, name), folder / name)
+    (folder / 'image1.bmp').write_bytes(b'not a bitmap')
+    monkeypatch.setattr(v3.Faces, 'folder', str(folder))
+    return folder
+
+
+@pytest.mark.parametrize('lazy', [True, False])
+def test_broken_face_is_drawn_instead(surface, broken_folder, lazy):
+    atlas = v3.Atlas(8, 50, surface, lazy)
+    try:
+        if lazy:
+            atlas.ensure(1)
+            while atlas.poll():
+                pass
+        assert all(atlas.loaded)
+    finally:
+        atlas.close()
+
+
+@pytest.mark.parametrize('depth', [16, 24, 32])
+def test_disk_cache_round_trip_with_padded_rows(surface, depth):
+    # a 103 pixel face has padded rows at 16 and 24 bits a pixel
+    display = v3.pygame.Surface((10, 10), 0, depth)
+    face = v3.Faces.generate(3, 103)
+    cached = v3.Faces.cache_path(b'face 3', 103, display)
+    v3.Faces.write_cached(cached, face, display)
+    assert os.path.getsize(cached) == 103 * 103 * display.get_bytesize()
+
+    read = v3.Faces.read_cached(cached, 103, display)
+    assert read is not None and not read.get_locked()
+    expected = v3.pygame.Surface((103, 103), 0, display)
+    expected.blit(face, (0, 0))
+    for point in [(0, 0), (51, 51), (102, 102), (102, 0), (0, 102)]:
+        assert read.get_at(point) == expected.get_at(point)
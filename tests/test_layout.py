@@ -0,0 +1,76 @@
+# Memory Layout Tests - Andrew Li
+# The tile under a point is found by dividing by the pitch, for square
+# and long boards in windows of any size, and a point on the margin,
+# in a gap or off the board is on no tile. No window is needed.
+
+import pytest
+
+from memory.v3 import Layout
+
+
+# User-defined functions
+
+def tile_at(layout, x, y):
+    # returns the cell whose tile has a point in it by looking at every
+    # tile, the slow way cell_at must agree with
+    # - layout is the Layout
+    # - x is the x coord of the point
+    # - y is the y coord of the point
+
+    for row_index in range(layout.rows):
+        for col_index in range(layout.cols):
+            left, top = layout.position(row_index, col_index)
+            if left <= x < left + layout.tile and top <= y < top + layout.tile:
+                return row_index, col_index
+    return None
+
+
+def test_gaps_and_margins():
+    layout = Layout((520, 415), 4, 4, side = 100)
+    assert (layout.pitch, layout.tile) == ((415 - 4 + 1) // 4, (415 - 4 + 1) // 4 - 1)
+    assert layout.cell_at(layout.x, layout.y) == (0, 0)
+    assert layout.cell_at(layout.x + layout.tile - 1, layout.y) == (0, 0)
+    # the gap after the first tile, the margin and past the last tile
+    assert layout.cell_at(layout.x + layout.tile, layout.y) is None
+    assert layout.cell_at(layout.x - 1, layout.y) is None
+    assert layout.cell_at(layout.x, layout.y - 1) is None
+    assert layout.cell_at(layout.right, layout.y) is None
+    assert layout.cell_at(layout.x, layout.bottom) is None
+    assert layout.cell_at(layout.right - 1, layout.bottom - 1) == (3, 3)
+    assert layout.cell_at(-500, -500) is None
+    assert layout.cell_at(5000, 5000) is None
+
+
+@pytest.mark.parametrize('size, rows, cols, side', [
+    ((130, 97), 4, 4, 20),
+    ((131, 60), 2, 8, 0),
+    ((60, 131), 8, 2, 10),
+    ((97, 97), 3, 6, 5),
+    ((40, 40), 16, 16, 0),
+])
+def test_every_point_agrees_with_the_tiles(size, rows, cols, side):
+    layout = Layout(size, rows, cols, side = side, gap = 2, margin = 3)
+    width, height = size
+    for y in range(-3, height + 3):
+        for x in range(-3, width + 3):
+            assert layout.cell_at(x, y) == tile_at(layout, x, y), (x, y)
+
+
+def test_long_board_after_a_resize():
+    # a resize makes a new layout for the new size of the window, the
+    # board fits the short side and is centred along the long one
+    wide = Layout((1400, 300), 2, 8, side = 100)
+    assert wide.pitch == (300 - 4 + 1) // 2
+    assert wide.y == 2 and wide.bottom <= 300 - 2
+    assert abs((wide.x - 2) - (1400 - 100 - 2 - wide.right)) <= 1
+
+    tall = Layout((300, 900), 2, 8, side = 100)
+    assert tall.pitch == (300 - 100 - 4 + 1) // 8
+    assert abs((tall.x - 2) - (300 - 100 - 2 - tall.right)) <= 1
+    assert abs((tall.y - 2) - (900 - 2 - tall.bottom)) <= 1
+
+    for layout in [wide, tall]:
+        for row_index in range(2):
+            for col_index in range(8):
+                x, y = layout.position(row_index, col_index)
+                assert layout.cell_at(x + layout.tile // 2, y + layout.tile // 2) == (row_index, col_index)
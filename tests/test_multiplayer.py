@@ -0,0 +1,54 @@
+# Memory Multiplayer Tests - Andrew Li
+# Turns pass on a wrong pair, a match scores and the player goes again,
+# and a BoardView kept from the deltas agrees with the TurnEngine.
+
+import random
+
+import pytest
+
+from memory.engine import MemoryEngine
+from memory.multiplayer import TurnEngine, BoardView, FIRST, MATCH, MISMATCH, encode_delta, decode_delta
+
+
+def test_match_scores_and_keeps_the_turn():
+    match = TurnEngine(2, MemoryEngine(2, 2, faces = [1, 2, 1, 2]))
+    assert match.flip(0, 0) == (0, 0, 1, FIRST, 0)
+    assert match.flip(0, 2) == (0, 2, 1, MATCH, 0)
+    assert list(match.scores) == [1, 0]
+
+
+def test_wrong_pair_passes_the_turn():
+    match = TurnEngine(3, MemoryEngine(2, 2, faces = [1, 2, 1, 2]))
+    match.flip(0, 0)
+    assert match.flip(0, 1) == (0, 1, 2, MISMATCH, 1)
+    assert match.flip(0, 3) is None
+    assert match.flip(1, 3) is not None
+
+
+def test_winners_share_the_most_pairs():
+    match = TurnEngine(2, MemoryEngine(2, 2, faces = [1, 2, 1, 2]))
+    match.scores[0] = 2
+    assert match.winners() == [0]
+    match.scores[1] = 2
+    assert match.winners() == [0, 1]
+
+
+def test_a_game_needs_a_player():
+    with pytest.raises(ValueError):
+        TurnEngine(0, MemoryEngine())
+
+
+def test_board_view_follows_the_deltas():
+    engine = MemoryEngine(4, 4, rng = random.Random(5))
+    match = TurnEngine(2, engine)
+    view = BoardView(4, 4, 2)
+    rng = random.Random(6)
+    while not engine.is_solved():
+        delta = match.flip(match.turn, rng.randrange(16))
+        if delta:
+            view.apply(decode_delta(encode_delta(delta).split()))
+            assert list(view.scores) == list(match.scores)
+            assert view.turn == match.turn
+            assert view.pending == engine.pending
+    assert view.remaining == 0
+    assert list(view.faces) == list(engine.faces)
@@ -0,0 +1,77 @@
+# Memory Replay Tests - Andrew Li
+# A game recorded with an InputRecorder and a ReplayClock is played
+# again from its log by v3.replay and ends the same way.
+
+import pygame
+
+from memory import v3
+from memory.replay import InputRecorder, ReplayClock, read_log, CLICK, QUIT, RESIZE
+
+
+# User-defined functions
+
+def script(faces):
+    # returns the tiles clicked in a game that has one wrong pair and
+    # then matches every pair
+    # - faces is the face of every tile
+
+    wrong = next(index for index in range(1, len(faces)) if faces[index] != faces[0])
+    clicks = [0, wrong]
+    for index in range(len(faces)):
+        for other in range(index + 1, len(faces)):
+            if faces[other] == faces[index]:
+                clicks += [index, other]
+    return clicks
+
+
+def test_recorded_game_replays_the_same(surface, tmp_path):
+    path = str(tmp_path / 'game.log')
+    seed = 7
+
+    # the game is played with a click every 90 frames, which is more
+    # than the time a wrong pair is shown, and the window is made
+    # bigger half way through
+    clock = ReplayClock()
+    recorder = InputRecorder(path, seed, 4, 6)
+    game = v3.Game(surface, 4, 6, None, seed, clock, recorder)
+    clicks = script(game.engine.faces)
+    frame = 0
+    try:
+        while game.continue_game:
+            frame += 1
+            clock.now += game.step
+            if frame == 600:
+                pygame.event.post(pygame.event.Event(pygame.VIDEORESIZE, size = (700, 560), w = 700, h = 560))
+            elif frame % 90 == 0 and clicks:
+                row_index, col_index = divmod(clicks.pop(0), game.cols)
+                x, y = game.layout.position(row_index, col_index)
+                pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONUP, pos = (x + 1, y + 1), button = 1))
+            game.frame()
+            assert frame < 10000
+        clock.now += game.step
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        game.frame()
+    finally:
+        recorder.close()
+        game.atlas.close()
+    assert game.engine.mismatches == 1
+
+    # the log has the board and the events, and playing them again
+    # gives the same board, moves, mismatches and time
+    logged_seed, rows, cols, events = read_log(path)
+    assert (logged_seed, rows, cols) == (seed, 4, 6)
+    kinds = [kind for ms, kind, x, y in events]
+    assert (kinds.count(CLICK), kinds.count(RESIZE), kinds[-1]) == (26, 1, QUIT)
+    pygame.display.set_mode((520, 415), pygame.RESIZABLE)
+    clock = ReplayClock()
+    again = v3.Game(pygame.display.get_surface(), rows, cols, None, logged_seed, clock)
+    try:
+        v3.replay(again, events, clock)
+    finally:
+        again.atlas.close()
+
+    assert again.close_clicked
+    assert list(again.engine.faces) == list(game.engine.faces)
+    assert again.engine.is_solved()
+    assert (again.engine.moves, again.engine.mismatches) == (game.engine.moves, game.engine.mismatches)
+    assert again.engine.time == game.engine.time
@@ -0,0 +1,25 @@
+# Memory Scores Tests - Andrew Li
+# Results are written by the thread of the ScoreStore and read back
+# in the order of the leaderboard.
+
+from memory.scores import ScoreStore
+
+
+def test_top_is_fastest_first(tmp_path):
+    store = ScoreStore(str(tmp_path / 'scores.db'), interval = 0.01)
+    store.add(1, 4, 4, 30.0, 12, 4)
+    store.add(2, 4, 4, 20.0, 14, 6)
+    store.add(3, 4, 4, 20.0, 10, 2)
+    store.add(4, 6, 6, 5.0, 20, 2)
+    store.flush()
+    assert [row[3] for row in store.top(4, 4, 2)] == [3, 2]
+    assert store.close() is None
+
+
+def test_writer_error_is_kept(tmp_path):
+    store = ScoreStore(str(tmp_path / 'scores.db'), interval = 0.01)
+    store.add(2**64, 4, 4, 30.0, 12, 4)
+    store.flush()
+    store.add(1, 4, 4, 30.0, 12, 4)
+    store.flush()
+    assert isinstance(store.close(), OverflowError)
@@ -0,0 +1,155 @@
+# Memory Server Tests - Andrew Li
+# The commands of the line protocol, answered by MemoryServer.command
+# on their own, and over TCP with a server listening on a free port.
+
+import asyncio
+
+from memory.server import MemoryServer
+
+
+# User-defined functions
+
+def send(server, line, owned, seated = None, writer = None):
+    # returns the answer of the server to a line of a connection
+    # - server is the MemoryServer
+    # - line is the command, as bytes
+    # - owned is the set of the ids of the sessions of the connection
+    # - seated is the dict of the seat of the connection in each of its rooms
+    # - writer is what the other players of a room send lines to
+
+    return server.command(line.split(), owned, seated, writer)
+
+
+def partner(faces, index):
+    # returns the other tile with the face of a tile
+    # - faces is the face of every tile
+    # - index is the index of the tile
+
+    return next(other for other in range(len(faces)) if other != index and faces[other] == faces[index])
+
+
+def miss(faces, index):
+    # returns a tile with another face than a tile
+    # - faces is the face of every tile
+    # - index is the index of the tile
+
+    return next(other for other in range(len(faces)) if faces[other] != faces[index])
+
+
+# User-defined classes
+
+class Lines:
+    # An object in this class stands in for the writer of a connection
+    # and keeps the lines sent to it.
+
+    def __init__(self):
+        # Initialize a Lines.
+        # - self is the Lines to initialize
+
+        self.lines = []
+
+    def write(self, line):
+        # keeps a line sent to the connection
+        # - self is the Lines
+        # - line is the line
+
+        self.lines.append(line)
+
+
+def test_session_commands():
+    server = MemoryServer(clock = lambda: 0.0)
+    owned = set()
+    session_id = int(send(server, b'new 2 2 1', owned).split()[1])
+    faces = server.sessions[session_id].engine.faces
+    other = partner(faces, 0)
+
+    assert send(server, b'flip %d 0' % session_id, owned) == b'ok %d 2\n' % faces[0]
+    assert send(server, b'flip %d 0' % session_id, owned) == b'ok -\n'
+    assert send(server, b'flip %d %d' % (session_id, other), owned) == b'ok %d 1\n' % faces[0]
+    states = bytearray(b'0000')
+    states[0] = states[other] = ord('1')
+    assert send(server, b'state %d' % session_id, owned) == b'ok %s 0.000 1 0\n' % bytes(states)
+    assert send(server, b'flip %d 4' % session_id, owned) == b'err no tile 4\n'
+    assert send(server, b'end %d' % session_id, owned) == b'ok\n'
+    assert not server.sessions and not owned
+
+
+def test_wrong_commands():
+    server = MemoryServer()
+    owned = set()
+    assert send(server, b'', owned) == b'err empty command\n'
+    assert send(server, b'new two 2', owned) == b'err arguments must be numbers\n'
+    assert send(server, b'jump 1', owned) == b'err unknown command\n'
+    assert send(server, b'new 0 2', owned).startswith(b'err ')
+    assert send(server, b'new 65 65', owned).startswith(b'err ')
+    assert send(server, b'new 3 3', owned).startswith(b'err ')
+
+
+def test_sessions_belong_to_their_connection():
+    server = MemoryServer()
+    mine = set()
+    session_id = int(send(server, b'new 4 4', mine).split()[1])
+    theirs = set()
+    for line in [b'flip %d 0', b'state %d', b'end %d']:
+        assert send(server, line % session_id, theirs) == b'err no session %d\n' % session_id
+    assert session_id in server.sessions
+
+
+def test_room_commands():
+    server = MemoryServer(clock = lambda: 0.0)
+    host, guest = Lines(), Lines()
+    host_seats, guest_seats = {}, {}
+    room_id = int(send(server, b'host 2 2 2 1', set(), host_seats, host).split()[1])
+    faces = server.rooms[room_id].engine.faces
+
+    assert send(server, b'move %d 0' % room_id, set(), host_seats, host) == b'err waiting for players\n'
+    assert send(server, b'join %d' % room_id, set(), guest_seats, guest) == b'ok 1 2 2 2\n'
+    assert host.lines == [b'joined 1\n']
+    assert send(server, b'join %d' % room_id, set(), {}, Lines()) == b'err room %d is full\n' % room_id
+    assert send(server, b'move %d 0' % room_id, set(), guest_seats, guest) == b'err not your turn\n'
+    assert send(server, b'move %d 0' % room_id, set(), {}, Lines()) == b'err not in room %d\n' % room_id
+
+    # a wrong pair passes the turn to the guest, who is sent every delta
+    wrong = miss(faces, 0)
+    assert send(server, b'move %d 0' % room_id, set(), host_seats, host) == b'ok 0 0 %d 0 0\n' % faces[0]
+    reply = send(server, b'move %d %d' % (room_id, wrong), set(), host_seats, host)
+    assert reply == b'ok 0 %d %d 2 1\n' % (wrong, faces[wrong])
+    assert guest.lines == [b'd 0 0 %d 0 0\n' % faces[0], b'd ' + reply[3:]]
+    assert send(server, b'move %d 0' % room_id, set(), host_seats, host) == b'err not your turn\n'
+
+
+def test_line_protocol_over_tcp():
+
+    async def play():
+        server = MemoryServer()
+        listener = await server.start('127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            host_reader, host_writer = await asyncio.open_connection('127.0.0.1', port)
+            guest_reader, guest_writer = await asyncio.open_connection('127.0.0.1', port)
+
+            async def ask(reader, writer, line):
+                writer.write(line + b'\n')
+                return await reader.readline()
+
+            room_id = int((await ask(host_reader, host_writer, b'host 2 2 2')).split()[1])
+            assert (await ask(guest_reader, guest_writer, b'join %d' % room_id)).startswith(b'ok 1 ')
+            assert await host_reader.readline() == b'joined 1\n'
+            assert (await ask(host_reader, host_writer, b'new 2 2')).startswith(b'ok ')
+
+            # the sessions and the room of a connection end when it closes,
+            # and the other players of the room are told
+            host_writer.close()
+            assert await guest_reader.readline() == b'gone 0\n'
+            assert (await ask(guest_reader, guest_writer, b'stats')).startswith(b'ok 1 0 0 ')
+
+            # a line over the limit of the reader is answered and the connection closed
+            guest_writer.write(b'x' * (2**16 + 1) + b'\n')
+            assert await guest_reader.readline() == b'err line too long\n'
+            assert await guest_reader.readline() == b''
+            guest_writer.close()
+        finally:
+            listener.close()
+            await listener.wait_closed()
+
+    asyncio.run(asyncio.wait_for(play(), 10))
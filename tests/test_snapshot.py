@@ -0,0 +1,129 @@
+# Memory Snapshot Tests - Andrew Li
+# A snapshot decodes to the game that was encoded, the Autosaver writes
+# the newest one, and a game is only saved once a move has been made.
+
+import random
+
+import pytest
+
+from memory import v3
+from memory.engine import MemoryEngine
+from memory.multiplayer import TurnEngine
+from memory.snapshot import Snapshot, Autosaver, read_snapshot
+
+
+# User-defined functions
+
+def engine_state(engine):
+    # returns everything a snapshot keeps of an engine
+    # - engine is the MemoryEngine
+
+    return (engine.rows, engine.cols, list(engine.faces), bytes(engine.state), engine.first, engine.pending,
+            engine.hide_time if engine.pending else None, engine.time, engine.moves, engine.matches,
+            engine.mismatches, engine.remaining)
+
+
+def round_trip(snapshot):
+    # returns the snapshot decoded from its bytes, checked against it
+    # - snapshot is the Snapshot to encode
+
+    decoded = Snapshot.decode(snapshot.encode())
+    assert engine_state(decoded.engine) == engine_state(snapshot.engine)
+    assert bytes(decoded.seen) == bytes(snapshot.seen)
+    assert (decoded.seed, decoded.players, decoded.bots, decoded.turn) == (
+        snapshot.seed, snapshot.players, snapshot.bots, snapshot.turn)
+    assert list(decoded.scores) == list(snapshot.scores)
+    return decoded
+
+
+def test_middle_of_a_move():
+    engine = MemoryEngine(6, 6, rng = random.Random(3))
+    engine.tick(12.5)
+    engine.flip(7)
+    seen = bytearray(36)
+    seen[7] = 1
+    assert round_trip(Snapshot(engine, seen, 3)).engine.first == 7
+
+
+def test_wrong_pair_waiting_to_be_hidden():
+    engine = MemoryEngine(2, 2, faces = [1, 2, 1, 2])
+    engine.flip(0)
+    engine.flip(1)
+    assert round_trip(Snapshot(engine, bytearray([1, 1, 0, 0]))).engine.pending == (0, 1)
+
+
+def test_players_and_largest_seed():
+    match = TurnEngine(3, MemoryEngine(2, 4, faces = [1, 2, 3, 4, 1, 2, 3, 4]))
+    match.flip(0, 0)
+    match.flip(0, 4)
+    match.flip(0, 1)
+    snapshot = Snapshot(match.engine, bytearray(8), 2**63 - 1, 3, 1, match.turn, match.scores)
+    assert round_trip(snapshot).seed == 2**63 - 1
+
+
+def test_wrong_size_is_rejected():
+    data = Snapshot(MemoryEngine(4, 4, rng = random.Random(1)), bytearray(16)).encode()
+    with pytest.raises(ValueError):
+        Snapshot.decode(data[:-1])
+    with pytest.raises(ValueError):
+        Snapshot.decode(data + b'\x00')
+
+
+def test_autosaver_writes_the_newest(tmp_path):
+    path = str(tmp_path / 'state' / 'snapshot.bin')
+    engine = MemoryEngine(2, 2, faces = [1, 2, 1, 2])
+    saver = Autosaver(path)
+    saver.save(Snapshot(engine, bytearray(4)))
+    engine.flip(0)
+    engine.flip(2)
+    saver.save(Snapshot(engine, bytearray(4)))
+    assert saver.close() is None
+    assert read_snapshot(path).engine.matches == 1
+
+    saver = Autosaver(path)
+    saver.remove()
+    assert saver.close() is None
+    assert not (tmp_path / 'state' / 'snapshot.bin').exists()
+
+
+def test_game_is_saved_after_a_move(surface, tmp_path):
+    path = tmp_path / 'snapshot.bin'
+    saver = Autosaver(str(path))
+    game = v3.Game(surface, 4, 4, seed = 1, saver = saver)
+    try:
+        # a game that was only opened, or is in its first move, does not
+        # replace the one saved before it
+        game.autosave()
+        game.engine.flip(0)
+        game.autosave()
+        assert saver.queue.empty()
+        game.engine.flip(1)
+        game.autosave()
+    finally:
+        game.atlas.close()
+    assert saver.close() is None
+    assert read_snapshot(str(path)).engine.moves == 1
+
+
+@pytest.mark.parametrize('overwrite', [False, True])
+def test_new_game_keeps_the_saved_one(overwrite, tmp_path, monkeypatch, capsys):
+    path = tmp_path / 'snapshot.bin'
+    kept = Snapshot(MemoryEngine(2, 2, faces = [1, 2, 1, 2]), bytearray(4)).encode()
+    path.write_bytes(kept)
+
+    def play(game):
+        # one move is made and the window is closed
+        game.engine.flip(0)
+        game.engine.flip(1)
+
+    monkeypatch.setattr(v3.Faces, 'cache_folder', str(tmp_path / 'faces'))
+    monkeypatch.setattr(v3.Game, 'play', play)
+    argv = ['--no-scores', '--snapshot', str(path)] + (['--overwrite-save'] if overwrite else [])
+    v3.start(v3.parse_options(argv))
+    v3.Faces.clear()
+
+    if overwrite:
+        assert read_snapshot(str(path)).engine.rows == 4
+    else:
+        assert path.read_bytes() == kept
+        assert '--overwrite-save' in capsys.readouterr().out
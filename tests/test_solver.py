@@ -0,0 +1,86 @@
+# Memory Solver Tests - Andrew Li
+# The expected moves of the best player, its flips, and the Knowledge
+# it is kept in one flip at a time.
+
+import random
+
+import pytest
+
+from memory.engine import MemoryEngine
+from memory.solver import Solver, Knowledge
+from memory.tournament import play_game
+
+
+def test_expected_moves():
+    solver = Solver()
+    assert solver.expected(2, 0) == 1.0
+    assert solver.expected(16, 0) == pytest.approx(12.393, abs = 0.001)
+
+
+def test_known_pair_is_flipped_first():
+    knowledge = Knowledge([1, 2, 1, 2, 3, 3])
+    knowledge.saw(0)
+    knowledge.saw(2)
+    index, expected = Solver().hint(knowledge)
+    assert index in (0, 2)
+    knowledge.saw(index)
+    assert Solver().hint(knowledge, index)[0] == 2 - index
+
+
+def test_partner_of_a_new_face():
+    knowledge = Knowledge([1, 2, 1, 2])
+    knowledge.saw(0)
+    knowledge.saw(1)
+    knowledge.saw(2)
+    assert Solver().hint(knowledge, 2)[0] == 0
+
+
+def test_solved_board_has_no_hint():
+    knowledge = Knowledge([1, 1])
+    knowledge.saw(0)
+    knowledge.saw(1)
+    knowledge.matched(1)
+    assert Solver().hint(knowledge) == (None, 0.0)
+
+
+def test_knowledge_kept_by_flips_matches_one_made_from_the_board():
+    engine = MemoryEngine(6, 6, rng = random.Random(2))
+    seen = bytearray(36)
+    knowledge = Knowledge(engine.faces)
+    rng = random.Random(3)
+    while not engine.is_solved():
+        index = rng.randrange(36)
+        if engine.flip(index):
+            seen[index] = 1
+            knowledge.saw(index)
+            if engine.first is None and engine.pending is None:
+                knowledge.matched(engine.faces[index])
+        made = Knowledge(engine.faces, seen, engine.state, engine.first, engine.pending)
+        assert made.unseen == knowledge.unseen
+        assert made.pairs == knowledge.pairs
+        assert made.singletons == knowledge.singletons
+        assert {face: sorted(tiles) for face, tiles in made.known.items()} == \
+               {face: sorted(tiles) for face, tiles in knowledge.known.items()}
+
+
+def test_perfect_player_takes_the_expected_moves():
+    games = [play_game('perfect', 4, 4, seed = seed) for seed in range(2000)]
+    mean = sum(engine.moves for engine in games) / len(games)
+    assert all(engine.is_solved() for engine in games)
+    assert mean == pytest.approx(Solver().expected(16, 0), abs = 0.1)
+
+
+@pytest.mark.parametrize('bots', [0, 1])
+def test_tables_are_filled_for_bots_only(bots, surface, monkeypatch):
+    from memory import v3
+
+    solver = Solver()
+    monkeypatch.setattr(v3, 'SOLVER', solver)
+    game = v3.Game(surface, 8, 8, seed = 1, players = 2, bots = bots)
+    try:
+        assert len(solver.moves) == (65 if bots else 0)
+        # the first hint fills them when there are no bots
+        assert game.best_flip() is not None
+        assert len(solver.moves) >= 65
+    finally:
+        game.atlas.close()
@@ -0,0 +1,41 @@
+# Memory Tournament Tests - Andrew Li
+# The scripted players of the tournament solve every board, and the
+# limited player takes as many moves as the one of batch.py.
+
+import sys
+
+import pytest
+
+from memory.tournament import main, play_game, run
+
+np = pytest.importorskip('numpy')
+from memory.batch import BatchEngine
+
+
+@pytest.mark.parametrize('player', ['random', 'perfect', 'limited'])
+def test_every_player_solves_the_board(player):
+    engine = play_game(player, 4, 6, seed = 3)
+    assert engine.is_solved()
+    assert engine.moves == engine.matches + engine.mismatches
+
+
+@pytest.mark.parametrize('memory', [4, 8])
+def test_limited_player_agrees_with_batch(memory):
+    moves = [play_game('limited', 4, 4, seed = seed, memory = memory).moves for seed in range(5000)]
+    batch = BatchEngine(50000, 4, 4, np.random.default_rng(0))
+    batch.play('limited', memory)
+    assert sum(moves) / len(moves) == pytest.approx(batch.moves.mean(), abs = 0.08)
+
+
+def test_same_results_on_one_or_many_processes():
+    setups = [('limited', 4, 4, 1.0)]
+    one = run(setups, 40, workers = 1, shard = 7)[0]
+    many = run(setups, 40, workers = 2, shard = 7)[0]
+    assert [stats.mean for stats in one] == pytest.approx([stats.mean for stats in many])
+
+
+def test_negative_memory_is_rejected(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['tournament', '--memory', '-1'])
+    with pytest.raises(SystemExit) as exit:
+        main()
+    assert exit.value.code == 2